@@ -18,10 +18,16 @@ from server.library.store.manifest import (
     update_manifest,
 )
 from server.utils.docid import ensure_dir, parse_doc_id
-from server.utils.fs_atomic import atomic_write
+from server.utils.fs_atomic import atomic_write_bytes
+from server.utils.pdfium_lock import PDFIUM_LOCK
 
 LOGGER = logging.getLogger(__name__)
 
+try:  # pragma: no cover - dépendances optionnelles
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - fallback
+    orjson = None  # type: ignore
+
 try:  # pragma: no cover - dépendances optionnelles
     import pypdfium2 as pdfium
 except ModuleNotFoundError:  # pragma: no cover - fallback
@@ -38,9 +44,6 @@ except ModuleNotFoundError:  # pragma: no cover - fallback
     Image = None  # type: ignore
 
 
-TOKEN_SPLITTER = re.compile(r"\s+")
-
-
 @dataclass(slots=True)
 class PageExtraction:
     """Représentation typée d'une page extraite."""
@@ -62,7 +65,7 @@ def compute_doc_hash(file_bytes: bytes) -> str:
 
     if not isinstance(file_bytes, (bytes, bytearray)):
         raise TypeError("file_bytes must be bytes-like")
-    digest = hashlib.sha256(bytes(file_bytes)).hexdigest()
+    digest = hashlib.sha256(file_bytes).hexdigest()
     return f"sha256:{digest}"
 
 
@@ -82,6 +85,12 @@ def _clean_text(text: str) -> str:
 def _perform_ocr(pdf_path: Path, page_index: int) -> str:
     if not (pdfium and pytesseract and Image):  # pragma: no cover - dépendances optionnelles
         return ""
+    # Le bitmap reste adossé au document : rendu et OCR sous le même verrou.
+    with PDFIUM_LOCK:
+        return _perform_ocr_locked(pdf_path, page_index)
+
+
+def _perform_ocr_locked(pdf_path: Path, page_index: int) -> str:
     try:
         document = pdfium.PdfDocument(str(pdf_path))
     except Exception as exc:  # pragma: no cover - dépendances optionnelles
@@ -107,6 +116,43 @@ def _perform_ocr(pdf_path: Path, page_index: int) -> str:
             pass
 
 
+def _pdfium_page_texts(pdf_path: Path) -> List[str] | None:
+    """Texte brut de chaque page via PDFium (C++), ``None`` pour repli pdfminer."""
+
+    if pdfium is None:
+        return None
+    with PDFIUM_LOCK:
+        return _pdfium_page_texts_locked(pdf_path)
+
+
+def _pdfium_page_texts_locked(pdf_path: Path) -> List[str] | None:
+    try:
+        document = pdfium.PdfDocument(str(pdf_path))
+    except Exception as exc:
+        LOGGER.warning("Lecture PDFium impossible, repli pdfminer : %s", exc)
+        return None
+    try:
+        texts: List[str] = []
+        for page_index in range(len(document)):
+            page = document.get_page(page_index)
+            textpage = page.get_textpage()
+            try:
+                # PDFium sépare les lignes par CRLF ; ``_clean_text`` attend LF.
+                texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            finally:
+                textpage.close()
+                page.close()
+        return texts
+    except Exception as exc:
+        LOGGER.warning("Extraction PDFium échouée, repli pdfminer : %s", exc)
+        return None
+    finally:
+        try:
+            document.close()
+        except AttributeError:  # pragma: no cover - compatibilité
+            pass
+
+
 def extract_text(pdf_path: Path | str) -> List[dict]:
     """Extrait le texte page par page avec fallback OCR si nécessaire."""
 
@@ -114,10 +160,13 @@ def extract_text(pdf_path: Path | str) -> List[dict]:
     if not path.exists():
         raise FileNotFoundError(f"PDF introuvable : {pdf_path}")
 
+    raw_texts: Iterable[str] | None = _pdfium_page_texts(path)
+    if raw_texts is None:
+        raw_texts = ("".join(_iter_text_chunks(layout)) for layout in extract_pages(str(path)))
+
     pages: List[PageExtraction] = []
-    for page_index, layout in enumerate(extract_pages(str(path)), start=1):
-        text_chunks = list(_iter_text_chunks(layout))
-        text = _clean_text("".join(text_chunks))
+    for page_index, raw_text in enumerate(raw_texts, start=1):
+        text = _clean_text(raw_text)
         has_ocr = False
         if not text:
             ocr_text = _perform_ocr(path, page_index - 1)
@@ -129,9 +178,8 @@ def extract_text(pdf_path: Path | str) -> List[dict]:
 
 
 def _estimate_tokens(text: str) -> int:
-    if not text:
-        return 0
-    return len(TOKEN_SPLITTER.split(text.strip()))
+    # ``str.split()`` découpe sur les mêmes blancs que ``\s+`` sans passer par ``re``.
+    return len(text.split())
 
 
 def segment_pages(pages: Iterable[dict], target_tokens: int = 1000) -> List[dict]:
@@ -159,7 +207,8 @@ def segment_pages(pages: Iterable[dict], target_tokens: int = 1000) -> List[dict
                 "segment_id": f"seg_{index:03d}",
                 "pages": [buffer_pages[0], buffer_pages[-1]],
                 "text": text,
-                "token_estimate": _estimate_tokens(text),
+                # Pages non vides jointes : le total des pages vaut le décompte du texte.
+                "token_estimate": token_count,
             }
         )
         buffer_text = []
@@ -187,6 +236,21 @@ def segment_pages(pages: Iterable[dict], target_tokens: int = 1000) -> List[dict
     return segments
 
 
+def _jsonl_line(item: dict) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(item)
+        except TypeError:  # clés non textuelles, entiers > 64 bits…
+            pass
+    return json.dumps(item, ensure_ascii=False).encode("utf-8")
+
+
+def _write_jsonl(path: Path, items: Iterable[dict]) -> None:
+    """Sérialise tous les enregistrements puis les écrit en une seule fois."""
+
+    atomic_write_bytes(path, b"".join(_jsonl_line(item) + b"\n" for item in items))
+
+
 def persist_extraction(
     doc_id: str,
     pages: Sequence[dict],
@@ -221,17 +285,6 @@ def persist_extraction(
     segments_path = target_dir / "segments.jsonl"
     pages_path = pages_dir / "pages.jsonl"
 
-    def _write_jsonl(path: Path, items: Iterable[dict]) -> None:
-        payload = list(items)
-
-        def _writer(tmp_path: Path) -> None:
-            with tmp_path.open("w", encoding="utf-8") as handle:
-                for item in payload:
-                    handle.write(json.dumps(item, ensure_ascii=False))
-                    handle.write("\n")
-
-        atomic_write(path, _writer)
-
     _write_jsonl(pages_path, pages_list)
     _write_jsonl(segments_path, segments_list)
 
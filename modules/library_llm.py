@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
 import json
 import logging
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 import re
@@ -200,12 +202,19 @@ def _select_segments(segments: Iterable[dict], max_segments: int = MAX_SEGMENTS)
                 "text": text[:MAX_SEGMENT_CHARS],
             }
         )
-    usable.sort(key=lambda item: len(item["text"]), reverse=True)
-    return usable[:max_segments]
+    # Équivaut à ``sorted(..., reverse=True)[:max_segments]`` (ordre stable
+    # conservé) sans trier tous les segments du document.
+    return heapq.nlargest(max_segments, usable, key=lambda item: len(item["text"]))
+
+
+@lru_cache(maxsize=1)
+def _plan_schema_json() -> str:
+    # Le schéma pydantic est figé à l'import : inutile de le régénérer par appel.
+    return json.dumps(get_plan_json_schema(), ensure_ascii=False)
 
 
 def _build_prompt(doc_id: str, segments: Sequence[dict]) -> str:
-    schema_json = json.dumps(get_plan_json_schema(), ensure_ascii=False)
+    schema_json = _plan_schema_json()
     header = (
         "Tu es chargé d'analyser des segments extraits d'un document clinique. "
         "Identifie des notions utiles pour la pratique, sans pathologiser, en restant synthétique. "
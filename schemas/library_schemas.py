@@ -90,4 +90,18 @@ def validate_plan_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
     return model.model_dump()
 
 
-__all__ = ["SchemaValidationError", "validate_plan_payload"]
+def validate_plan_payload_json(raw: bytes | str) -> Dict[str, Any]:
+    """Variante de :func:`validate_plan_payload` pour un corps JSON brut.
+
+    Le parseur de pydantic-core lit directement les octets : pas de
+    ``json.loads`` intermédiaire ni de dictionnaire Python jetable.
+    """
+
+    try:
+        model = PlanPayloadModel.model_validate_json(raw)
+    except ValidationError as exc:
+        raise SchemaValidationError(exc.errors()) from exc
+    return model.model_dump()
+
+
+__all__ = ["SchemaValidationError", "validate_plan_payload", "validate_plan_payload_json"]
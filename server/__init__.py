@@ -25,6 +25,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from flask import Flask, jsonify, request, send_file, render_template
 
+from .json_provider import OrjsonProvider
 from .transcriber import Transcriber, Segment
 from .pipeline import ResearchPipeline, FinalPipeline
 
@@ -118,6 +119,7 @@ def create_app(upload_dir: Optional[str] = None, archive_dir: Optional[str] = No
     # Configure Flask to serve static files from the accompanying client directory
     client_dir = Path(__file__).resolve().parents[1] / "client"
     app = Flask(__name__, static_folder=str(client_dir), static_url_path="/static")
+    app.json = OrjsonProvider(app)
     app.json_sort_keys = False
 
     # compute directories
@@ -11,8 +11,10 @@ Ce fichier héberge désormais deux blueprints :
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import json
 import logging
+import os
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
@@ -20,7 +22,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List, Mapping, Optional
 
 from collections import Counter
 
@@ -32,7 +34,6 @@ from pydantic import ValidationError
 from modules.library_index import ensure_index_layout, hybrid_search, index_notion, index_segments
 from modules.library_ingest import (
     InvalidDocumentId,
-    compute_doc_hash,
     extract_text,
     persist_extraction,
     segment_pages,
@@ -53,7 +54,7 @@ from server.library.store.manifest import (
     update_manifest,
 )
 from server.utils.docid import doc_id_to_fs_path, ensure_dir, legacy_fs_path, parse_doc_id
-from server.utils.fs_atomic import atomic_write, atomic_write_bytes, atomic_write_text
+from server.utils.fs_atomic import atomic_write, atomic_write_text, sibling_temp_file
 from server.services.metadata_infer import (
     default_toggles,
     extract_pdf_streams,
@@ -74,6 +75,9 @@ from .plan_schema import (
     normalize_plan_payload,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - annotations seulement
+    from werkzeug.datastructures import FileStorage
+
 try:  # pragma: no cover - dépendance optionnelle
     from filelock import FileLock
 except ModuleNotFoundError:  # pragma: no cover - fallback sans verrouillage
@@ -90,6 +94,7 @@ ensure_index_layout()
 EXECUTOR = ThreadPoolExecutor(max_workers=2)
 STATE_LOCK = threading.Lock()
 MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1 << 20
 
 LLM_PLAN_COUNTERS: Counter[str] = Counter()
 
@@ -341,14 +346,38 @@ def _primary_extraction_dir(doc_id: str, fs_config: LibraryFSConfig) -> Path:
     )
 
 
+def _spool_upload(
+    file: "FileStorage", directory: Path
+) -> tuple[Path, str, int]:
+    """Copie l'upload dans ``directory`` en calculant son SHA256 au passage.
+
+    Une seule lecture séquentielle, par blocs : le PDF n'est jamais chargé
+    entièrement en mémoire.  La copie s'arrête dès que ``MAX_UPLOAD_BYTES``
+    est dépassé ; l'appelant compare la taille renvoyée à la limite.
+    """
+
+    digest = hashlib.sha256()
+    size = 0
+    with sibling_temp_file(Path(directory) / "upload") as (handle, spool_path):
+        while size <= MAX_UPLOAD_BYTES:
+            chunk = file.stream.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+            handle.write(chunk)
+            size += len(chunk)
+    return spool_path, f"sha256:{digest.hexdigest()}", size
+
+
 def _validate_pdf_payload(
-    file: "werkzeug.datastructures.FileStorage", payload: bytes
+    file: "FileStorage", payload: bytes | BinaryIO
 ) -> tuple[bool, Dict[str, object]]:
     mimetype = (file.mimetype or "").lower()
     if mimetype and "pdf" not in mimetype:
         return False, {"error": "invalid_mimetype", "message": "Le fichier doit être un PDF."}
+    source = BytesIO(payload) if isinstance(payload, (bytes, bytearray)) else payload
     try:
-        page_iter = PDFPage.get_pages(BytesIO(payload), caching=False)
+        page_iter = PDFPage.get_pages(source, caching=False)
         page_count = sum(1 for _ in page_iter)
     except PDFSyntaxError:
         return False, {"error": "invalid_pdf", "message": "Fichier PDF illisible."}
@@ -656,69 +685,68 @@ def upload_document():
     file = request.files.get("file")
     if file is None:
         return jsonify({"ok": False, "error": "Fichier PDF requis."}), 400
-    payload = file.read()
-    if not payload:
-        return jsonify({"ok": False, "error": "Le fichier est vide."}), 400
-    if len(payload) > MAX_UPLOAD_BYTES:
-        return jsonify({"ok": False, "error": "Le fichier dépasse la taille autorisée (25 Mo)."}), 413
-
-    is_valid_pdf, pdf_info = _validate_pdf_payload(file, payload)
-    if not is_valid_pdf:
-        return jsonify(pdf_info), 400
-
     fs_config = _resolve_fs_config()
-    doc_id = compute_doc_hash(payload)
-
+    spool_path, doc_id, size = _spool_upload(file, fs_config.raw_root)
     try:
-        parse_doc_id(doc_id)
-    except ValueError:
-        return jsonify({"error": "invalid_doc_id"}), 400
+        if not size:
+            return jsonify({"ok": False, "error": "Le fichier est vide."}), 400
+        if size > MAX_UPLOAD_BYTES:
+            return jsonify({"ok": False, "error": "Le fichier dépasse la taille autorisée (25 Mo)."}), 413
 
-    target_path = _resolve_raw_pdf_path(fs_config, doc_id)
-    extraction_dir = _primary_extraction_dir(doc_id, fs_config)
+        with spool_path.open("rb") as handle:
+            is_valid_pdf, pdf_info = _validate_pdf_payload(file, handle)
+        if not is_valid_pdf:
+            return jsonify(pdf_info), 400
 
-    with _doc_lock(fs_config, doc_id):
-        if not target_path.exists():
-            ensure_dir(target_path.parent)
-            atomic_write_bytes(target_path, payload)
-        else:
+        try:
+            parse_doc_id(doc_id)
+        except ValueError:
+            return jsonify({"error": "invalid_doc_id"}), 400
+
+        target_path = _resolve_raw_pdf_path(fs_config, doc_id)
+        extraction_dir = _primary_extraction_dir(doc_id, fs_config)
+
+        with _doc_lock(fs_config, doc_id):
             try:
                 existing_size = target_path.stat().st_size
             except OSError:
                 existing_size = -1
-            if existing_size != len(payload):
-                atomic_write_bytes(target_path, payload)
+            if existing_size != size:
+                ensure_dir(target_path.parent)
+                os.replace(spool_path, target_path)
 
-        ensure_manifest(
-            doc_id,
-            extraction_dir,
-            source_filename=file.filename,
-            file_size_bytes=len(payload),
-        )
+            ensure_manifest(
+                doc_id,
+                extraction_dir,
+                source_filename=file.filename,
+                file_size_bytes=size,
+            )
 
-        existing = _get_metadata(doc_id, fs_config) or {}
-        form_data = {key: request.form.get(key, "") for key in request.form.keys()}
-        metadata_entry = _build_metadata_payload(form_data, doc_id, target_path, existing=existing)
-        _upsert_metadata(fs_config, metadata_entry)
-
-        manifest_context = {
-            "source_filename": file.filename,
-            "bytes": len(payload),
-            "pages": pdf_info.get("pages"),
-            "tags": metadata_entry.get("keywords") or [],
-            "options": {
-                "autosuggest_pre_default": metadata_entry.get("autosuggest_pre_default", False),
-                "autosuggest_post_default": metadata_entry.get("autosuggest_post_default", False),
-            },
-        }
+            existing = _get_metadata(doc_id, fs_config) or {}
+            form_data = {key: request.form.get(key, "") for key in request.form.keys()}
+            metadata_entry = _build_metadata_payload(form_data, doc_id, target_path, existing=existing)
+            _upsert_metadata(fs_config, metadata_entry)
+
+            manifest_context = {
+                "source_filename": file.filename,
+                "bytes": size,
+                "pages": pdf_info.get("pages"),
+                "tags": metadata_entry.get("keywords") or [],
+                "options": {
+                    "autosuggest_pre_default": metadata_entry.get("autosuggest_pre_default", False),
+                    "autosuggest_post_default": metadata_entry.get("autosuggest_post_default", False),
+                },
+            }
 
-        update_manifest(
-            extraction_dir,
-            {
-                "metadata_form": metadata_entry,
-                "uploaded_pages": pdf_info.get("pages"),
-            },
-        )
+            update_manifest(
+                extraction_dir,
+                {
+                    "metadata_form": metadata_entry,
+                    "uploaded_pages": pdf_info.get("pages"),
+                },
+            )
+    finally:
+        spool_path.unlink(missing_ok=True)
 
     manifest_data = load_manifest(extraction_dir)
     prefill_manifest: Dict[str, object] | None = None
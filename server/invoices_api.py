@@ -18,6 +18,7 @@ from flask import Blueprint, Response, jsonify, request, send_file
 from .assets_bootstrap import AssetPaths, ensure_assets, refresh_logo_cache
 from .invoice_template import build_invoice_docx
 from .pdf_pipeline import fallback_ready, soffice_available, to_pdf
+from .utils.pdfium_lock import PDFIUM_LOCK
 
 try:  # pragma: no cover - dépendance optionnelle
     import pypdfium2 as pdfium  # type: ignore
@@ -414,10 +415,11 @@ def preview_invoice():
     with TemporaryDirectory() as tmp_dir:
         docx_path = build_invoice_docx(invoice, assets)
         pdf_path = to_pdf(docx_path, invoice, assets, output_dir=Path(tmp_dir), output_name="preview.pdf")
-        page = pdfium.PdfDocument(str(pdf_path))[0]
-        bitmap = page.render(scale=2).to_pil()
         buffer = BytesIO()
-        bitmap.save(buffer, format="PNG")
+        with PDFIUM_LOCK:
+            page = pdfium.PdfDocument(str(pdf_path))[0]
+            bitmap = page.render(scale=2).to_pil()
+            bitmap.save(buffer, format="PNG")
         encoded = base64.b64encode(buffer.getvalue()).decode()
         if docx_path.exists():
             docx_path.unlink()
@@ -0,0 +1,64 @@
+"""JSON provider backed by :mod:`orjson` when it is installed.
+
+Responses of the post-session routes carry full transcripts, segment lists
+and research hits; serialising them with the standard library dominates the
+response time.  :class:`OrjsonProvider` keeps the behaviour of Flask's
+:class:`~flask.json.provider.DefaultJSONProvider` (``default`` hook, key
+sorting, compact/indented output) and falls back to it whenever ``orjson``
+is missing or cannot encode a value (e.g. integers wider than 64 bits).
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialise with ``orjson`` and parse with it, keeping Flask's defaults."""
+
+    def _options(self, indent: bool = False) -> int:
+        # Dates keep Flask's RFC 822 format through ``default``.
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _encode(self, obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=self._options(indent))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or set(kwargs) - {"separators", "indent"}:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._encode(obj, bool(kwargs.get("indent"))).decode("utf-8")
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = self._encode(obj, indent)
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        # Encoded bytes go straight to the response, without a str round-trip.
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+__all__ = ["OrjsonProvider"]
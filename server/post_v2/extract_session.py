@@ -86,6 +86,17 @@ MEDS = {_norm(entry): entry for entry in _load_list(_lexicon_path("meds.txt"))}
 THEMES = {key: [_norm(token) for token in tokens] for key, tokens in _load_yaml(_lexicon_path("themes.yaml")).items()}
 REQ_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in _load_yaml(_lexicon_path("requests.yaml")).get("patterns", [])]
 
+
+def _word_pattern(token: str) -> re.Pattern[str]:
+    return re.compile(rf"\b{re.escape(token)}\b")
+
+
+# Lexicon patterns are compiled once at import; each extraction only searches.
+MED_PATTERNS = [(_word_pattern(lexeme_norm), lexeme_raw) for lexeme_norm, lexeme_raw in MEDS.items() if lexeme_norm]
+THEME_PATTERNS = {
+    category: [_word_pattern(keyword) for keyword in keywords if keyword] for category, keywords in THEMES.items()
+}
+
 THERAPIST_MARKERS = re.compile(
     r"\b(je (?:te|vous) (?:rassure|propose|invite|conseille|suggere)|je (?:pense|voudrais) que tu)\b",
     re.IGNORECASE,
@@ -101,11 +112,8 @@ def _detect_meds(transcript: str) -> Tuple[List[Dict[str, object]], List[str]]:
     normalized = _norm(transcript)
     meds: List[Dict[str, object]] = []
     matched_tokens: List[str] = []
-    for lexeme_norm, lexeme_raw in MEDS.items():
-        if not lexeme_norm:
-            continue
-        pattern = rf"\b{re.escape(lexeme_norm)}\b"
-        if re.search(pattern, normalized):
+    for pattern, lexeme_raw in MED_PATTERNS:
+        if pattern.search(normalized):
             meds.append({"name": lexeme_raw, "status": "en cours", "effects": []})
             matched_tokens.append(lexeme_raw)
     return meds, matched_tokens
@@ -113,11 +121,9 @@ def _detect_meds(transcript: str) -> Tuple[List[Dict[str, object]], List[str]]:
 
 def _count_themes(normalized_transcript: str) -> Tuple[List[str], Dict[str, int]]:
     counts: Counter[str] = Counter()
-    for category, keywords in THEMES.items():
-        for keyword in keywords:
-            if not keyword:
-                continue
-            counts[category] += len(re.findall(rf"\b{re.escape(keyword)}\b", normalized_transcript))
+    for category, patterns in THEME_PATTERNS.items():
+        for pattern in patterns:
+            counts[category] += len(pattern.findall(normalized_transcript))
     ordered = [category for category, _ in counts.most_common() if counts[category] > 0][:6]
     return ordered, dict(counts)
 
@@ -188,10 +194,10 @@ def _condense_sentence(sentence: str) -> str | None:
 
 
 def _context_for_category(category: str, sentences: List[str]) -> str | None:
-    keywords = THEMES.get(category, [])
+    patterns = THEME_PATTERNS.get(category, [])
     for sentence in reversed(sentences):
         normalized_sentence = _norm(sentence)
-        if any(re.search(rf"\b{re.escape(keyword)}\b", normalized_sentence) for keyword in keywords):
+        if any(pattern.search(normalized_sentence) for pattern in patterns):
             simplified = _condense_sentence(sentence)
             if simplified:
                 return simplified
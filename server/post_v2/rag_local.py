@@ -119,9 +119,19 @@ def _format_pages(meta) -> str:
     return "s.o."
 
 
+_EVIDENCE_WEIGHTS: Dict[str, float] = {
+    "élevé": 1.0,
+    "eleve": 1.0,
+    "modéré": 0.7,
+    "modere": 0.7,
+    "faible": 0.4,
+    "inconnu": 0.3,
+    "": 0.3,
+}
+
+
 def _weight_evidence(level: str) -> float:
-    mapping = {"élevé": 1.0, "eleve": 1.0, "modéré": 0.7, "modere": 0.7, "faible": 0.4, "inconnu": 0.3, "": 0.3}
-    return mapping.get((level or "").lower(), 0.3)
+    return _EVIDENCE_WEIGHTS.get((level or "").lower(), 0.3)
 
 
 def _weight_year(year: int) -> float:
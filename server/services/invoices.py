@@ -496,7 +496,8 @@ def generate_invoice_pdf(invoice: dict, persist: bool = True) -> Optional[Path]:
         target_dir = Path(tempfile.mkdtemp(prefix="invoice-preview-"))
     identifier = str(invoice.get("id") or _slugify(invoice.get("number", "")))
     pdf_target = (target_dir / identifier).with_suffix(".pdf")
-    doc_path = _merge_docx_template(invoice)
+    # Sans LibreOffice, la fusion du modèle DOCX serait jetée aussitôt.
+    doc_path = _merge_docx_template(invoice) if shutil.which("soffice") else None
     if doc_path:
         pdf = _convert_doc_to_pdf(doc_path, pdf_target)
         try:
@@ -14,9 +14,15 @@ from decimal import ROUND_HALF_UP, Decimal
 import json
 import os
 from pathlib import Path
+import threading
 import uuid
 from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional
 
+try:  # pragma: no cover - dépendance optionnelle
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - repli json
+    orjson = None  # type: ignore[assignment]
+
 __all__ = [
     "InvoiceNumberCollisionError",
     "PdfGenerationError",
@@ -64,8 +70,56 @@ LibreOfficeConverter = Callable[[Mapping[str, Any], Path], Path | None]
 ReportLabGenerator = Callable[[Mapping[str, Any], Path], Path | None]
 
 
+_CENT = Decimal("0.01")
+
+
 def _quantize(value: Decimal) -> Decimal:
-    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return value.quantize(_CENT, rounding=ROUND_HALF_UP)
+
+
+def _sum_amounts(lines: Iterable[InvoiceLine]) -> tuple[Decimal, Decimal, Decimal]:
+    """Totaux HT, TVA et TTC en un seul parcours des lignes.
+
+    Les montants restent en ``Decimal`` : ils sont déjà arrondis au centime,
+    leurs sommes sont exactes (pas d'erreur d'arrondi binaire).
+    """
+
+    total_ht = total_tva = total_ttc = Decimal("0")
+    for line in lines:
+        total_ht += line.amount_ht
+        total_tva += line.amount_tva
+        total_ttc += line.amount_ttc
+    return _quantize(total_ht), _quantize(total_tva), _quantize(total_ttc)
+
+
+def _read_json(path: Path) -> Any:
+    """Lit ``path`` en une fois ; lève ``OSError`` ou ``ValueError`` si illisible."""
+
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    """Sérialise ``payload`` (indenté, UTF-8) puis remplace ``path`` atomiquement.
+
+    Avec orjson, la sortie suit ``json.dumps(indent=2)`` sauf pour les
+    flottants en notation exponentielle (``1e-7`` au lieu de ``1e-07``) ;
+    les deux relisent la même valeur.
+    """
+
+    data: bytes | None = None
+    if orjson is not None:
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        except TypeError:  # valeur hors du périmètre orjson : repli json
+            data = None
+    if data is None:
+        data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
 
 
 class InvoicingService:
@@ -90,7 +144,9 @@ class InvoicingService:
         self._invoices: List[MutableMapping[str, Any]] = self._load_invoices()
         self._numbers = {invoice["number"] for invoice in self._invoices}
         self._index = {invoice["number"]: invoice for invoice in self._invoices}
+        # Seule lecture de ``counter.json`` : ensuite la mémoire fait foi.
         self._counters: Dict[str, int] = self._load_counters()
+        self._counter_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Chargement / persistance
@@ -112,18 +168,12 @@ class InvoicingService:
         return filtered
 
     def _persist_invoices(self) -> None:
-        tmp_path = self._invoices_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as handle:
-            json.dump(self._invoices, handle, ensure_ascii=False, indent=2)
-        tmp_path.replace(self._invoices_path)
+        _write_json(self._invoices_path, self._invoices)
 
     def _load_counters(self) -> Dict[str, int]:
-        if not self._counter_path.exists():
-            return {}
         try:
-            with self._counter_path.open("r", encoding="utf-8") as handle:
-                data = json.load(handle)
-        except (OSError, json.JSONDecodeError):
+            data = _read_json(self._counter_path)
+        except (OSError, ValueError):
             return {}
         if not isinstance(data, dict):
             return {}
@@ -134,19 +184,19 @@ class InvoicingService:
         return counters
 
     def _persist_counters(self) -> None:
-        tmp_path = self._counter_path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as handle:
-            json.dump(self._counters, handle, ensure_ascii=False, indent=2)
-        tmp_path.replace(self._counter_path)
+        _write_json(self._counter_path, self._counters)
 
     # ------------------------------------------------------------------
     # Génération des numéros et création de factures
     # ------------------------------------------------------------------
     def _default_number_generator(self, invoice_date: date) -> str:
         year_key = str(invoice_date.year)
-        current = self._counters.get(year_key, 0) + 1
-        self._counters[year_key] = current
-        self._persist_counters()
+        # L'écriture reste sous le verrou : ``counter.tmp`` est partagé et deux
+        # remplacements concurrents pourraient réécrire un compteur plus ancien.
+        with self._counter_lock:
+            current = self._counters.get(year_key, 0) + 1
+            self._counters[year_key] = current
+            self._persist_counters()
         return f"{year_key}-{current:04d}"
 
     def _prepare_line(self, raw: Mapping[str, Any]) -> InvoiceLine:
@@ -192,9 +242,7 @@ class InvoicingService:
             numbering_mode = "auto"
         self._numbers.add(invoice_number)
 
-        total_ht = _quantize(sum((line.amount_ht for line in prepared_lines), Decimal("0")))
-        total_tva = _quantize(sum((line.amount_tva for line in prepared_lines), Decimal("0")))
-        total_ttc = _quantize(sum((line.amount_ttc for line in prepared_lines), Decimal("0")))
+        total_ht, total_tva, total_ttc = _sum_amounts(prepared_lines)
 
         invoice_id = str(uuid.uuid4())
         invoice_payload: MutableMapping[str, Any] = {
@@ -24,10 +24,15 @@ from .suggestions import suggest_modules_from_postsession
 from .validators import validate_selection
 
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _slugify(value: str) -> str:
-    normalized = unicodedata.normalize('NFKD', value or '').encode('ascii', 'ignore').decode('ascii')
+    normalized = value or ''
+    if not normalized.isascii():
+        normalized = unicodedata.normalize('NFKD', normalized).encode('ascii', 'ignore').decode('ascii')
     normalized = normalized.lower()
-    normalized = re.sub(r"[^a-z0-9]+", '-', normalized).strip('-')
+    normalized = _NON_ALNUM_RE.sub('-', normalized).strip('-')
     return normalized or 'document'
 
 
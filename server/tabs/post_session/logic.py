@@ -19,6 +19,7 @@ explicitement commentées pour faciliter les audits futurs.
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import math
 import os
@@ -30,6 +31,8 @@ import subprocess
 import tempfile
 import textwrap
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -48,6 +51,7 @@ from server.services import env
 from server.services.paths import ensure_patient_subdir
 from server.services.patients_repo import ARCHIVES_ROOT
 from server.util import slugify
+from server.utils.fs_atomic import atomic_write_text
 
 # --- Chemins de stockage --------------------------------------------------
 
@@ -61,6 +65,9 @@ TEXT_COMPATIBLE_EXTENSIONS = {".txt", ".md", ".rtf"}
 _MAX_AUDIO_BYTES = 50 * 1024 * 1024  # 50 Mo pour éviter les abus
 _DEFAULT_SEGMENT_LENGTH = 18.0  # durée fictive par segment (secondes)
 _MAX_REFERENCES = 3
+_HASH_CHUNK_BYTES = 1 << 20  # lecture par blocs de 1 Mio pour le hachage audio
+_RUNS_CACHE_DIRNAME = "runs_cache"
+_TRANSCRIPTS_CACHE_DEFAULT_MB = 200  # plafond du cache de transcriptions
 
 # Fallback minimaliste pour le critical pack lorsque le fichier est absent
 _FALLBACK_LENSES = [
@@ -276,6 +283,25 @@ def unpack_research_context(token: str) -> Dict[str, object]:
 # --- Fonctions audio / transcription -------------------------------------
 
 
+def _validate_audio(header: bytes, ext: str, size: int) -> None:
+    """Contrôle commun aux uploads en mémoire et aux copies disque.
+
+    ``header`` n'a besoin que des premiers octets du fichier : les signatures
+    WAV/MP3 vérifiées ici tiennent sur quatre octets.
+    """
+
+    if ext not in SUPPORTED_AUDIO_EXTENSIONS | TEXT_COMPATIBLE_EXTENSIONS:
+        raise ValueError("unsupported_audio_format")
+    if not size:
+        raise ValueError("empty_audio")
+    if size > _MAX_AUDIO_BYTES:
+        raise ValueError("audio_too_large")
+    if ext in {".wav"} and not header.startswith(b"RIFF"):
+        raise ValueError("corrupted_audio")
+    if ext in {".mp3"} and not header.startswith((b"ID3", b"\xff\xfb", b"\xff\xf3")):
+        raise ValueError("corrupted_audio")
+
+
 def _read_bytes(file_storage: FileStorage) -> Tuple[bytes, str]:
     """Valide et lit le fichier audio fourni par Flask."""
 
@@ -292,15 +318,7 @@ def _read_bytes(file_storage: FileStorage) -> Tuple[bytes, str]:
     except Exception:
         pass
     data = file_storage.read() if hasattr(file_storage, "read") else b""
-    if not data:
-        raise ValueError("empty_audio")
-    if len(data) > _MAX_AUDIO_BYTES:
-        raise ValueError("audio_too_large")
-
-    if ext in {".wav"} and not data.startswith(b"RIFF"):
-        raise ValueError("corrupted_audio")
-    if ext in {".mp3"} and not data.startswith((b"ID3", b"\xff\xfb", b"\xff\xf3")):
-        raise ValueError("corrupted_audio")
+    _validate_audio(data, ext, len(data))
 
     try:
         file_storage.stream.seek(0)
@@ -309,6 +327,22 @@ def _read_bytes(file_storage: FileStorage) -> Tuple[bytes, str]:
     return data, ext
 
 
+def _read_path_bytes(path: str, ext: str) -> bytes:
+    """Valide et lit un fichier audio déjà déposé sur disque."""
+
+    if ext not in SUPPORTED_AUDIO_EXTENSIONS | TEXT_COMPATIBLE_EXTENSIONS:
+        raise ValueError("unsupported_audio_format")
+    try:
+        size = os.path.getsize(path)
+    except OSError as exc:
+        raise ValueError("missing_audio") from exc
+
+    with open(path, "rb") as handle:
+        _validate_audio(handle.read(4), ext, size)
+        handle.seek(0)
+        return handle.read()
+
+
 def _decode_audio_bytes(data: bytes, ext: str) -> str:
     """Convertit un audio simulé en texte exploitable."""
 
@@ -456,6 +490,37 @@ def transcribe_audio(
     """Transcrit l'audio en texte."""
 
     data, ext = _read_bytes(file_storage)
+    return _transcribe_data(data, ext, None, retries=retries, timeout=timeout, verbose=verbose)
+
+
+def transcribe_audio_path(
+    path: str,
+    *,
+    ext: Optional[str] = None,
+    retries: int = 2,
+    timeout: float = 60.0,
+    verbose: Optional[bool] = None,
+) -> TranscriptResult:
+    """Transcrit un audio déjà déposé sur disque (voir :func:`spooled_upload`).
+
+    Le fichier sert directement à ffprobe et au découpage en morceaux : il
+    n'est pas recopié dans un second fichier temporaire.
+    """
+
+    ext = (ext if ext is not None else os.path.splitext(path)[1]).lower()
+    data = _read_path_bytes(path, ext)
+    return _transcribe_data(data, ext, path, retries=retries, timeout=timeout, verbose=verbose)
+
+
+def _transcribe_data(
+    data: bytes,
+    ext: str,
+    audio_path: Optional[str],
+    *,
+    retries: int,
+    timeout: float,
+    verbose: Optional[bool],
+) -> TranscriptResult:
     verbose = env.is_true("VERBOSE_WHISPER") if verbose is None else verbose
     last_error: Optional[Exception] = None
     text = ""
@@ -475,13 +540,14 @@ def transcribe_audio(
     if not success:
         raise ValueError("transcription_failed") from last_error
 
-    temp_path: Optional[str] = None
-    try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext or "") as handle:
-            handle.write(data)
-            temp_path = handle.name
-    except Exception:
-        temp_path = None
+    temp_path: Optional[str] = audio_path
+    if temp_path is None:
+        try:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=ext or "") as handle:
+                handle.write(data)
+                temp_path = handle.name
+        except Exception:
+            temp_path = None
 
     dur_raw = _ffprobe_duration(temp_path)
     last_end = _last_segment_end({"segments": segments})
@@ -531,7 +597,7 @@ def transcribe_audio(
         last_end = _last_segment_end({"segments": segments})
         coverage = (last_end or 0.0) / (dur_raw or 1.0)
 
-    if temp_path:
+    if temp_path and audio_path is None:
         try:
             os.unlink(temp_path)
         except OSError:
@@ -556,6 +622,193 @@ def transcribe_audio(
         metadata=metadata,
     )
 
+def _hash_audio_stream(file_storage: FileStorage) -> Optional[str]:
+    """Calcule le SHA-256 du flux audio sans le charger entièrement en mémoire."""
+
+    stream = getattr(file_storage, "stream", None)
+    if stream is None:
+        return None
+    digest = hashlib.sha256()
+    try:
+        stream.seek(0)
+        for chunk in iter(lambda: stream.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        stream.seek(0)
+    except Exception:
+        return None
+    return digest.hexdigest()
+
+
+def _hash_audio_file(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _spool_dir() -> Optional[str]:
+    """Répertoire de dépôt des uploads (``None`` : dossier temporaire système)."""
+
+    # Pas de tmpfs par défaut : ``/dev/shm`` est en RAM et un upload
+    # volumineux y consommerait la mémoire du serveur.
+    return env.env("POST_SESSION_SPOOL_DIR", "") or None
+
+
+@contextmanager
+def spooled_upload(file_storage: FileStorage) -> Iterator[str]:
+    """Recopie l'upload dans un fichier temporaire nommé et en cède le chemin.
+
+    Werkzeug conserve l'upload dans un ``SpooledTemporaryFile`` ; le recopier
+    une fois par blocs permet de transmettre un chemin au pipeline (hash,
+    ffprobe, découpage) sans recharger ni redéposer l'audio.  La copie
+    s'interrompt avec ``audio_too_large`` dès que ``_MAX_AUDIO_BYTES`` est
+    dépassé.  Le fichier est supprimé à la sortie du bloc.
+    """
+
+    if file_storage is None:
+        raise ValueError("missing_audio")
+    filename = getattr(file_storage, "filename", "") or "audio"
+    suffix = os.path.splitext(filename)[1].lower()
+    try:
+        file_storage.stream.seek(0)
+    except Exception:
+        pass
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=_spool_dir()) as handle:
+        tmp_path = handle.name
+        try:
+            written = 0
+            for chunk in iter(lambda: file_storage.stream.read(_HASH_CHUNK_BYTES), b""):
+                written += len(chunk)
+                if written > _MAX_AUDIO_BYTES:
+                    raise ValueError("audio_too_large")
+                handle.write(chunk)
+        except BaseException:
+            handle.close()
+            os.unlink(tmp_path)
+            raise
+    try:
+        yield tmp_path
+    finally:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _transcripts_cache_dir() -> Optional[Path]:
+    try:
+        base = Path(current_app.instance_path) / "post_session" / "transcripts_cache"
+    except RuntimeError:  # hors contexte applicatif
+        return None
+    base.mkdir(parents=True, exist_ok=True)
+    return base
+
+
+def _transcripts_cache_limit() -> int:
+    raw = env.env("POST_SESSION_TRANSCRIPT_CACHE_MB", _TRANSCRIPTS_CACHE_DEFAULT_MB)
+    try:
+        return max(0, int(float(raw) * 1024 * 1024))
+    except (TypeError, ValueError):
+        return _TRANSCRIPTS_CACHE_DEFAULT_MB * 1024 * 1024
+
+
+def _evict_transcripts_cache(cache_dir: Path, max_bytes: int) -> None:
+    """Supprime les entrées les moins récemment utilisées au-delà du plafond."""
+
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if not entry.is_file() or not entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return
+    entries.sort()
+    for _, size, path in entries:
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def _transcript_to_dict(transcript: TranscriptResult) -> Dict[str, object]:
+    return {
+        "text": transcript.text,
+        "segments": transcript.segments,
+        "language": transcript.language,
+        "duration": transcript.duration,
+        "metadata": transcript.metadata,
+    }
+
+
+def transcribe_audio_cached(
+    file_storage: FileStorage,
+    *,
+    audio_path: Optional[str] = None,
+    digest: Optional[str] = None,
+    **kwargs,
+) -> TranscriptResult:
+    """Variante de :func:`transcribe_audio` adossée à un cache par contenu.
+
+    Les transcriptions sont indexées par le SHA-256 des octets audio dans
+    ``instance/post_session/transcripts_cache``.  Un fichier déjà transcrit
+    (nouvel essai, rechargement de page) ne repasse pas par le modèle.
+    ``audio_path`` désigne une copie disque de l'upload (voir
+    :func:`spooled_upload`), utilisée de préférence au flux Flask.
+    ``digest`` évite de rehacher l'audio quand l'appelant l'a déjà calculé.
+    """
+
+    filename = getattr(file_storage, "filename", "") or "audio"
+    ext = os.path.splitext(filename)[1].lower()
+
+    def _transcribe() -> TranscriptResult:
+        if audio_path:
+            return transcribe_audio_path(audio_path, ext=ext, **kwargs)
+        return transcribe_audio(file_storage, **kwargs)
+
+    cache_dir = _transcripts_cache_dir()
+    if cache_dir is not None and digest is None:
+        digest = _hash_audio_file(audio_path) if audio_path else _hash_audio_stream(file_storage)
+    if cache_dir is None or digest is None:
+        return _transcribe()
+
+    cache_path = cache_dir / f"{digest}.json"
+    try:
+        with open(cache_path, "r", encoding="utf-8") as fh:
+            cached = json.load(fh)
+    except (OSError, ValueError):
+        cached = None
+    if isinstance(cached, dict) and (cached.get("metadata") or {}).get("source_ext") == ext:
+        try:
+            os.utime(cache_path)  # rafraîchit l'horodatage pour l'éviction LRU
+        except OSError:
+            pass
+        return TranscriptResult(
+            text=cached.get("text") or "",
+            segments=list(cached.get("segments") or []),
+            language=cached.get("language") or "fr",
+            duration=float(cached.get("duration") or 0.0),
+            metadata=dict(cached.get("metadata") or {}),
+        )
+
+    transcript = _transcribe()
+    try:
+        atomic_write_text(cache_path, json.dumps(_transcript_to_dict(transcript), ensure_ascii=False))
+        _evict_transcripts_cache(cache_dir, _transcripts_cache_limit())
+    except Exception:
+        pass
+    return transcript
+
 # --- Extraction du plan et des éléments clefs -----------------------------
 
 
@@ -946,6 +1199,21 @@ def load_recent_history(patient_hint: Optional[str], limit: int = 3) -> List[Dic
         )
     return history_entries
 
+
+# Les étapes indépendantes du pipeline (lecture des archives pendant
+# l'extraction du plan) s'exécutent en parallèle sur ce pool partagé.
+_STAGE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="post-session")
+
+
+def load_recent_history_async(patient_hint: Optional[str], limit: int = 3) -> "Future[List[Dict[str, str]]]":
+    """Lance :func:`load_recent_history` en tâche de fond.
+
+    Le chargement ne dépend que du système de fichiers ; il peut donc se
+    dérouler pendant que le thread appelant calcule le plan.
+    """
+
+    return _STAGE_EXECUTOR.submit(load_recent_history, patient_hint, limit)
+
 # --- Recherche critique ---------------------------------------------------
 
 _LIBRARY_INDEX = Path(__file__).resolve().parents[1] / "library" / "store" / "library_index.jsonl"
@@ -1751,7 +2019,31 @@ def _persist_assets(
         asset_manager.write_text(debug_path, "\n".join(lines))
 
 
-def process_post_session(audio_file: FileStorage, options: Dict[str, object] = None) -> Dict[str, object]:
+def _options_signature(options: Dict[str, object], file_storage: FileStorage) -> str:
+    """Sérialise de manière canonique les options influençant le résultat."""
+
+    canonical = {str(key): value for key, value in options.items()}
+    # Le nom de fichier sert de repli pour le prénom : il fait partie de la clef.
+    canonical["_filename"] = getattr(file_storage, "filename", "") or ""
+    encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def _load_cached_run(path: Path) -> Optional[Dict[str, object]]:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def process_post_session(
+    audio_file: FileStorage,
+    options: Dict[str, object] = None,
+    *,
+    audio_path: Optional[str] = None,
+) -> Dict[str, object]:
     options = options or {}
 
     patient_name = _derive_patient_name(options, audio_file)
@@ -1762,16 +2054,32 @@ def process_post_session(audio_file: FileStorage, options: Dict[str, object] = N
         or patient_name
     )
 
-    run_id = _generate_run_id(options)
     storage_root = ensure_patient_subdir(patient_slug, "notes/post_session")
     asset_manager = AssetManager(storage_root)
+
+    # Une resoumission du même audio (retry, rafraîchissement) avec les mêmes
+    # options réutilise le résultat complet déjà calculé.
+    cache_path: Optional[Path] = None
+    audio_digest = _hash_audio_file(audio_path) if audio_path else _hash_audio_stream(audio_file)
+    if audio_digest:
+        cache_key = f"{audio_digest}-{_options_signature(options, audio_file)}"
+        cache_path = storage_root / _RUNS_CACHE_DIRNAME / f"{cache_key}.json"
+        cached = _load_cached_run(cache_path)
+        if cached is not None:
+            return cached
+
+    run_id = _generate_run_id(options)
     run_dir = asset_manager.create_run_dir(run_id)
 
-    transcript = transcribe_audio(audio_file, retries=3)
+    transcript = transcribe_audio_cached(
+        audio_file, audio_path=audio_path, digest=audio_digest, retries=3
+    )
+    # L'historique ne dépend pas du plan : il est chargé pendant l'extraction.
+    history_future = load_recent_history_async(patient_slug or patient_name)
     artifacts = compute_plan_artifacts(transcript.text, segments=transcript.segments)
 
     use_tu = _should_use_tu(options)
-    history = load_recent_history(patient_slug or patient_name)
+    history = history_future.result()
 
     try:
         search_limit = int(options.get("searchLimit", _MAX_REFERENCES) or _MAX_REFERENCES)
@@ -1816,7 +2124,7 @@ def process_post_session(audio_file: FileStorage, options: Dict[str, object] = N
         debug_payload,
     )
 
-    return {
+    result = {
         "runId": run_id,
         "transcript": transcript.text,
         "segments": transcript.segments,
@@ -1850,3 +2158,11 @@ def process_post_session(audio_file: FileStorage, options: Dict[str, object] = N
         "researchContext": pack_research_context(research),
     }
 
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            asset_manager.write_json(cache_path, result)
+        except Exception:
+            pass
+    return result
+
@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 import re
+import threading
 from datetime import datetime
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -16,13 +17,17 @@ from server.library.vector_db import VectorDB
 LOGGER = logging.getLogger(__name__)
 
 _VECTOR_DB: Optional[VectorDB] = None
+_VECTOR_DB_LOCK = threading.Lock()
 
 
 def _vector_db() -> VectorDB:
     global _VECTOR_DB
     if _VECTOR_DB is None:
-        store_dir = os.getenv("LIBRARY_VECTOR_STORE_DIR")
-        _VECTOR_DB = VectorDB(store_dir=store_dir)
+        # Les recherches candidates tournent en parallèle : une seule instance.
+        with _VECTOR_DB_LOCK:
+            if _VECTOR_DB is None:
+                store_dir = os.getenv("LIBRARY_VECTOR_STORE_DIR")
+                _VECTOR_DB = VectorDB(store_dir=store_dir)
     return _VECTOR_DB
 
 
@@ -34,18 +39,19 @@ def _embed_query(query: str) -> List[float]:
     return vectors[0]
 
 
+_EVIDENCE_WEIGHTS: Dict[str, float] = {
+    "élevé": 1.0,
+    "eleve": 1.0,
+    "modéré": 0.7,
+    "modere": 0.7,
+    "faible": 0.4,
+    "inconnu": 0.3,
+    "": 0.3,
+}
+
+
 def _weight_evidence(level: str) -> float:
-    normalized = (level or "").strip().lower()
-    mapping = {
-        "élevé": 1.0,
-        "eleve": 1.0,
-        "modéré": 0.7,
-        "modere": 0.7,
-        "faible": 0.4,
-        "inconnu": 0.3,
-        "": 0.3,
-    }
-    return mapping.get(normalized, 0.3)
+    return _EVIDENCE_WEIGHTS.get((level or "").strip().lower(), 0.3)
 
 
 def _weight_year(year: int) -> float:
@@ -6,34 +6,34 @@ partir d'un fichier audio envoyé par le client.  Le point d'entrée
 recherche documentaire et la génération du prompt final.
 """
 
+import copy
 import hashlib
+import json
+import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from flask import abort, current_app, jsonify, request, send_file, url_for
-from typing import Any, Dict, List, Optional
+from werkzeug.exceptions import RequestEntityTooLarge
+from typing import Any, Dict, List, Optional, Tuple
 
 from server.services.env import is_true
 
+try:  # pragma: no cover - dépendance optionnelle
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 from . import bp
-from .logic import (
-    _derive_patient_name,
-    _should_use_tu,
-    compute_plan_artifacts,
-    format_plan_text,
-    load_recent_history,
-    pack_plan_artifacts,
-    pack_research_context,
-    process_post_session,
-    run_prompt_stage,
-    run_research_stage,
-    summarize_research_for_ui,
-    transcribe_audio,
-    unpack_plan_artifacts,
-    unpack_research_context,
-    build_canonical_transcript_text,
-)
-from .research_engine_v2 import search_evidence as search_evidence_v2
+
+# ``.logic`` et ``.research_engine_v2`` (index vectoriel, numpy) sont importés
+# dans les handlers qui en ont besoin : /ping et le téléchargement des
+# transcripts n'en paient pas le coût au démarrage.
 
 
 _ERROR_STATUS = {
@@ -53,6 +53,7 @@ _ERROR_STATUS = {
     'invalid_search_limit': 400,
     'empty_plan': 422,
     'invalid_context': 400,
+    'payload_too_large': 413,
 }
 
 _ERROR_MESSAGES = {
@@ -72,8 +73,24 @@ _ERROR_MESSAGES = {
     'invalid_search_limit': 'Le paramètre searchLimit doit être un entier.',
     'empty_plan': 'Le plan fourni est vide.',
     'invalid_context': 'Le contexte transmis est invalide.',
+    'payload_too_large': 'La requête dépasse la taille autorisée.',
 }
 
+# Les transcripts et jetons de contexte pèsent rarement plus de quelques
+# centaines de Ko : au-delà, la requête est refusée avant tout décodage.
+_MAX_JSON_PAYLOAD_BYTES = 16 * 1024 * 1024
+
+
+# Plafond d'une requête audio : 50 Mo (``_MAX_AUDIO_BYTES`` de ``.logic``) plus
+# une marge pour l'enveloppe multipart et les champs du formulaire.  Vérifié
+# avant l'analyse du corps, qui déposerait sinon tout l'upload sur disque.
+_MAX_AUDIO_REQUEST_BYTES = 51 * 1024 * 1024
+
+
+def _audio_request_too_large() -> bool:
+    length = request.content_length
+    return length is not None and length > _MAX_AUDIO_REQUEST_BYTES
+
 
 def _handle_value_error(exc: ValueError):
     code = str(exc) or 'processing_error'
@@ -104,73 +121,163 @@ def _build_research_query(plan: Dict[str, Any]) -> str:
     return " ".join(segments).strip()
 
 
+# Alias camelCase envoyés par le client -> clefs canoniques snake_case.
+_PAYLOAD_ALIASES = {
+    'planContext': 'plan_context',
+    'planStructure': 'plan_structure',
+    'planText': 'plan_text',
+    'patientName': 'patient_name',
+    'patientId': 'patient_id',
+    'useTu': 'use_tu',
+    'searchLimit': 'search_limit',
+    'searchQuery': 'query',
+    'minYear': 'min_year',
+    'minEvidenceLevel': 'min_evidence_level',
+    'researchContext': 'research_context',
+    'contextToken': 'context',
+}
+
+
+def _normalize_payload(payload: Any) -> Dict[str, Any]:
+    """Renomme les clefs d'un payload JSON vers leur forme snake_case.
+
+    Une seule passe sur les clefs remplace les cascades de
+    ``payload.get('camelCase') or payload.get('snake_case')``.  Lorsque deux
+    variantes coexistent, la première valeur non vide est conservée.
+    """
+
+    if not isinstance(payload, dict):
+        return {}
+    normalized: Dict[str, Any] = {}
+    for key, value in payload.items():
+        canonical = _PAYLOAD_ALIASES.get(key, key)
+        if canonical not in normalized or not normalized[canonical]:
+            normalized[canonical] = value
+    return normalized
+
+
+def _coerce_domains(raw: Any) -> List[str]:
+    if isinstance(raw, str):
+        return [raw] if raw else []
+    if isinstance(raw, (list, tuple)):
+        return [str(item) for item in raw if item]
+    return []
+
+
+def _coerce_year(raw: Any) -> Optional[int]:
+    if raw is None or raw == "":
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def _coerce_level(raw: Any) -> Optional[str]:
+    return raw if isinstance(raw, str) and raw else None
+
+
+def _pick(layers: Tuple[Dict[str, Any], ...], key: str, coerce):
+    """Première valeur exploitable de ``key`` en parcourant les couches."""
+
+    for layer in layers:
+        value = coerce(layer.get(key))
+        if value:
+            return value
+    return coerce(None)
+
+
 def _extract_filter_params(payload: Dict[str, Any]) -> Dict[str, Any]:
-    domains: List[str] = []
-    min_year_val: Optional[int] = None
-    min_evidence: Optional[str] = None
-
-    def _merge(source: Dict[str, Any]) -> None:
-        nonlocal domains, min_year_val, min_evidence
-        raw_domains = source.get("domains")
-        if raw_domains and not domains:
-            if isinstance(raw_domains, str):
-                domains = [raw_domains]
-            elif isinstance(raw_domains, (list, tuple)):
-                domains = [str(item) for item in raw_domains if item]
-        raw_year = source.get("min_year") or source.get("minYear")
-        if raw_year is not None and min_year_val is None:
-            try:
-                min_year_val = int(raw_year)
-            except (TypeError, ValueError):
-                min_year_val = None
-        raw_level = source.get("min_evidence_level") or source.get("minEvidenceLevel")
-        if isinstance(raw_level, str) and not min_evidence:
-            min_evidence = raw_level
-
-    filters_candidate = payload.get("filters")
-    if isinstance(filters_candidate, dict):
-        _merge(filters_candidate)
     research_section = payload.get("research")
-    if isinstance(research_section, dict) and isinstance(research_section.get("filters"), dict):
-        _merge(research_section["filters"])
-    if not domains and isinstance(payload.get("domains"), (list, tuple)):
-        domains = [str(item) for item in payload.get("domains", []) if item]
-    elif not domains and isinstance(payload.get("domains"), str):
-        domains = [payload["domains"]]
-    if min_year_val is None:
-        raw_year = payload.get("min_year") or payload.get("minYear")
-        if raw_year is not None:
-            try:
-                min_year_val = int(raw_year)
-            except (TypeError, ValueError):
-                min_year_val = None
-    if not min_evidence:
-        raw_level = payload.get("min_evidence_level") or payload.get("minEvidenceLevel")
-        if isinstance(raw_level, str):
-            min_evidence = raw_level
+    nested = research_section.get("filters") if isinstance(research_section, dict) else None
+    layers = (
+        *(_normalize_payload(candidate) for candidate in (payload.get("filters"), nested) if isinstance(candidate, dict)),
+        payload,
+    )
     return {
-        "domains": domains,
-        "min_year": min_year_val,
-        "min_evidence_level": min_evidence,
+        "domains": _pick(layers, "domains", _coerce_domains),
+        "min_year": _pick(layers, "min_year", _coerce_year),
+        "min_evidence_level": _pick(layers, "min_evidence_level", _coerce_level),
     }
 
 
+def _format_pages(start: Any, end: Any) -> str:
+    if isinstance(start, int) and isinstance(end, int) and start and end:
+        return f"p. {start}" if start == end else f"p. {start}-{end}"
+    return ""
+
+
 def _format_hits_for_ui(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    formatted: List[Dict[str, Any]] = []
-    for hit in hits:
-        pages = ""
-        start = hit.get("page_start")
-        end = hit.get("page_end")
-        if isinstance(start, int) and isinstance(end, int) and start and end:
-            pages = f"p. {start}" if start == end else f"p. {start}-{end}"
-        formatted.append({
+    return [
+        {
             "title": hit.get("title", ""),
             "summary": hit.get("extract", ""),
             "source": hit.get("authors", ""),
-            "pages": pages,
+            "pages": _format_pages(hit.get("page_start"), hit.get("page_end")),
             "score": hit.get("score"),
-        })
-    return formatted
+        }
+        for hit in hits
+    ]
+
+
+def _hit_key(hit: Dict[str, Any]) -> Any:
+    return hit.get("chunk_id") or (hit.get("title"), hit.get("page_start"))
+
+
+# Requêtes candidates (surcharge, plan, transcript) : pool dédié pour ne pas
+# occuper ``_STAGE_EXECUTOR`` des autres étapes post-séance.
+_RESEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="post-session-research")
+# Une requête d'embedding n'a pas besoin de toute la séance ; la borne reste
+# loin de la limite de tokens des modèles d'embedding.
+_MAX_RESEARCH_QUERY_CHARS = 2000
+
+
+def _trim_research_query(text: str) -> str:
+    if len(text) <= _MAX_RESEARCH_QUERY_CHARS:
+        return text
+    head = text[:_MAX_RESEARCH_QUERY_CHARS]
+    return (head.rsplit(None, 1)[0] or head).strip()
+
+
+def _search_candidates_v2(queries: List[str], filters: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    """Interroge la bibliothèque pour chaque requête candidate en parallèle.
+
+    Les résultats sont fusionnés (meilleur score par extrait) puis tronqués à
+    ``limit`` ; une requête en échec n'invalide pas les autres.
+    """
+
+    from .research_engine_v2 import search_evidence as search_evidence_v2
+
+    futures = [
+        _RESEARCH_EXECUTOR.submit(
+            search_evidence_v2,
+            candidate,
+            domains=filters.get("domains"),
+            min_year=filters.get("min_year"),
+            min_evidence_level=filters.get("min_evidence_level"),
+            k=limit,
+        )
+        for candidate in queries
+    ]
+    merged: Dict[Any, Dict[str, Any]] = {}
+    errors: List[Exception] = []
+    for candidate, future in zip(queries, futures):
+        try:
+            hits = future.result()
+        except Exception as exc:
+            errors.append(exc)
+            current_app.logger.warning("[research] v2 query failed: %s", exc)
+            continue
+        current_app.logger.info("[research] v2 hits=%d query='%s'", len(hits), candidate[:80])
+        for hit in hits:
+            key = _hit_key(hit)
+            current = merged.get(key)
+            if current is None or (hit.get("score") or 0.0) > (current.get("score") or 0.0):
+                merged[key] = hit
+    if errors and len(errors) == len(futures):
+        raise errors[0]
+    ranked = sorted(merged.values(), key=lambda hit: hit.get("score") or 0.0, reverse=True)
+    return ranked[:limit]
 
 
 def _execute_research_v2(
@@ -183,21 +290,15 @@ def _execute_research_v2(
     plan = getattr(artifacts, "plan", {}) if artifacts is not None else {}
     if not isinstance(plan, dict):
         plan = {}
-    plan_query = _build_research_query(plan)
-    candidates = [
-        (query_override or "").strip(),
-        plan_query,
-        transcript.strip(),
-    ]
-    query = next((candidate for candidate in candidates if candidate), transcript.strip())
-    current_app.logger.info("[research] v2=True query='%s'", query)
-    hits = search_evidence_v2(
-        query,
-        domains=filters.get("domains"),
-        min_year=filters.get("min_year"),
-        min_evidence_level=filters.get("min_evidence_level"),
-        k=max(1, limit),
-    )
+    stripped_transcript = transcript.strip()
+    queries: List[str] = []
+    for candidate in ((query_override or "").strip(), _build_research_query(plan), stripped_transcript):
+        candidate = _trim_research_query(candidate)
+        if candidate and candidate not in queries:
+            queries.append(candidate)
+    query = queries[0] if queries else stripped_transcript
+    current_app.logger.info("[research] v2=True query='%s' candidates=%d", query, len(queries))
+    hits = _search_candidates_v2(queries or [query], filters, max(1, limit))
     evidence_sheet_parts = [hit.get("extract", "") for hit in hits if hit.get("extract")]
     evidence_sheet = "\n\n".join(evidence_sheet_parts).strip()
     return {
@@ -211,6 +312,39 @@ def _execute_research_v2(
         "filters": filters,
     }
 
+
+def _load_json_payload() -> Dict[str, Any]:
+    """Décode le corps JSON de la requête, ou lève ``ValueError``.
+
+    Un corps vide ou trop volumineux est rejeté d'après ``Content-Length``
+    sans être lu.  Sans cet en-tête (corps « chunked »), Werkzeug borne la
+    lecture via ``max_content_length``.  Le décodage passe par orjson
+    lorsqu'il est disponible.
+    """
+
+    size = request.content_length
+    if size == 0:
+        raise ValueError('empty_transcript')
+    if size is not None and size > _MAX_JSON_PAYLOAD_BYTES:
+        raise ValueError('payload_too_large')
+    if not request.is_json:
+        return {}
+    # Werkzeug tronque un flux à la borne sans lever : lire un octet de plus
+    # que le plafond suffit à distinguer un corps trop long.
+    request.max_content_length = _MAX_JSON_PAYLOAD_BYTES + 1
+    try:
+        raw = request.get_data(cache=False)
+    except RequestEntityTooLarge as exc:
+        raise ValueError('payload_too_large') from exc
+    if len(raw) > _MAX_JSON_PAYLOAD_BYTES:
+        raise ValueError('payload_too_large')
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:  # orjson.JSONDecodeError hérite de ValueError
+        return {}
+    return _normalize_payload(data)
+
+
 def _handle_unexpected_error():
     return (
         jsonify(
@@ -235,12 +369,111 @@ def _patient_options_from_payload(payload):
     options = {}
     if not isinstance(payload, dict):
         return options
-    for key in ('patientName', 'patient', 'tutoiement', 'useTu'):
+    for option_key, key in (
+        ('patientName', 'patient_name'),
+        ('patient', 'patient'),
+        ('tutoiement', 'tutoiement'),
+        ('useTu', 'use_tu'),
+    ):
         if key in payload and payload[key] is not None:
-            options[key] = payload[key]
+            options[option_key] = payload[key]
     return options
 
 
+@lru_cache(maxsize=1)
+def _research_v2_enabled() -> bool:
+    """Drapeau ``RESEARCH_V2`` lu une seule fois par processus.
+
+    Après modification de l'environnement à chaud, appeler
+    ``_research_v2_enabled.cache_clear()``.
+    """
+
+    return is_true('RESEARCH_V2')
+
+
+_PLAN_CACHE_SIZE = 64
+_PLAN_CACHE: "OrderedDict[str, Any]" = OrderedDict()
+_PLAN_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=128)
+def _unpack_plan_shared(token: str):
+    from .logic import unpack_plan_artifacts
+
+    return unpack_plan_artifacts(token)
+
+
+def _unpack_plan_cached(token: str):
+    """Décode un jeton ``planContext`` ; le jeton opaque sert de clef.
+
+    L'instance mise en cache est partagée : chaque appel en reçoit une copie
+    profonde, qu'un handler peut modifier sans affecter les requêtes suivantes.
+    """
+
+    return copy.deepcopy(_unpack_plan_shared(token))
+
+
+def _plan_cache_key(transcript: str, segments, plan_override, plan_text) -> str:
+    digest = hashlib.blake2b(transcript.encode('utf-8'), digest_size=16)
+    extras = json.dumps([segments, plan_override, plan_text], sort_keys=True, ensure_ascii=False, default=str)
+    digest.update(extras.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _compute_plan_cached(transcript: str, segments, plan_override, plan_text):
+    from .logic import compute_plan_artifacts
+
+    key = _plan_cache_key(transcript, segments, plan_override, plan_text)
+    with _PLAN_CACHE_LOCK:
+        cached = _PLAN_CACHE.get(key)
+        if cached is not None:
+            _PLAN_CACHE.move_to_end(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    artifacts = compute_plan_artifacts(
+        transcript,
+        segments=segments,
+        plan_override=plan_override,
+        plan_text=plan_text,
+    )
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE[key] = artifacts
+        while len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+    # Le cache garde l'original intact : l'appelant reçoit sa propre copie.
+    return copy.deepcopy(artifacts)
+
+
+def _resolve_artifacts(payload: Dict[str, Any], transcript: str):
+    """Retourne ``(artifacts, None)`` ou ``(None, réponse d'erreur)``.
+
+    Le plan provient du jeton ``plan_context`` s'il est fourni, sinon il est
+    calculé à partir de la transcription et des éventuelles surcharges.
+    """
+
+    plan_context_token = payload.get('plan_context')
+    if plan_context_token:
+        if not isinstance(plan_context_token, str):
+            return None, _handle_value_error(ValueError('invalid_context'))
+        try:
+            return _unpack_plan_cached(plan_context_token), None
+        except ValueError:
+            return None, _handle_value_error(ValueError('invalid_context'))
+
+    plan_override = payload.get('plan_structure')
+    if not isinstance(plan_override, dict):
+        plan_override = None
+    plan_text_input = payload.get('plan_text') or payload.get('plan')
+    segments = _extract_segments(payload)
+    try:
+        artifacts = _compute_plan_cached(transcript, segments, plan_override, plan_text_input)
+    except ValueError as exc:
+        return None, _handle_value_error(exc)
+    except Exception:
+        return None, _handle_unexpected_error()
+    return artifacts, None
+
+
 @bp.get('/ping')
 def ping():
     """Permet de tester la disponibilité du blueprint."""
@@ -251,6 +484,11 @@ def ping():
 def process():
     """Orchestre le traitement complet post-séance."""
 
+    from .logic import process_post_session, spooled_upload
+
+    if _audio_request_too_large():
+        return _handle_value_error(ValueError('audio_too_large'))
+
     file_key = None
     if 'audio' in request.files:
         file_key = 'audio'
@@ -273,7 +511,8 @@ def process():
             options[key] = request.form[key]
 
     try:
-        payload = process_post_session(audio_file, options)
+        with spooled_upload(audio_file) as audio_path:
+            payload = process_post_session(audio_file, options, audio_path=audio_path)
     except ValueError as exc:
         return _handle_value_error(exc)
     except Exception:
@@ -282,35 +521,76 @@ def process():
     return jsonify({'success': True, 'data': payload})
 
 
+def _transcript_storage_path() -> str:
+    """Chemin normalisé du dossier des transcripts, sans accès disque."""
+
+    return os.path.normpath(os.path.join(current_app.instance_path, 'post_session', 'transcripts'))
+
+
 def _transcript_storage_dir() -> Path:
-    base = Path(current_app.instance_path) / 'post_session' / 'transcripts'
+    base = Path(_transcript_storage_path())
     base.mkdir(parents=True, exist_ok=True)
     return base
 
 
+_TRANSCRIPT_NAME_RE = re.compile(r'-([0-9a-f]{8})\.txt$')
+# Les transcripts sont des données cliniques : jamais de cache partagé
+# (``private``) et revalidation systématique (``no-cache``).  Le navigateur
+# garde au plus une copie qu'il ne réutilise qu'après un 304 sur l'ETag.
+_REVALIDATE_CACHE_CONTROL = 'private, no-cache'
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+_STREAM_CHUNK_BYTES = 1 << 20
+
+
+def _stream_text_stats(path: str):
+    """Retourne (nombre de caractères, sha256) d'un fichier UTF-8 en une passe.
+
+    Le fichier est lu par blocs binaires : les caractères sont comptés en
+    écartant les octets de continuation UTF-8, sans décodage ni copie texte.
+    """
+
+    digest = hashlib.sha256()
+    length = 0
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(_STREAM_CHUNK_BYTES), b''):
+            digest.update(chunk)
+            length += len(chunk.translate(None, _UTF8_CONTINUATION_BYTES))
+    return length, digest.hexdigest()
+
+
 @bp.get('/transcript/<path:filename>')
 def get_transcript_file(filename: str):
     """Expose un transcript sauvegardé côté serveur."""
 
-    base_dir = _transcript_storage_dir().resolve()
-    candidate = (base_dir / filename).resolve()
-    if base_dir not in candidate.parents and candidate != base_dir:
+    # Validation purement lexicale : aucun realpath/stat avant l'ouverture.
+    base_dir = _transcript_storage_path()
+    candidate = os.path.normpath(os.path.join(base_dir, filename))
+    if not candidate.startswith(base_dir + os.sep):
         abort(403)
-    if not candidate.exists() or not candidate.is_file():
+    if not os.path.isfile(candidate):
         abort(404)
 
-    text = candidate.read_text(encoding='utf-8')
-    length = len(text)
-    sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    # Les noms ``ps-<ms>-<sha8>.txt`` adressent un contenu immuable : le
+    # suffixe sert d'ETag fort et la revalidation se passe de lecture disque.
+    match = _TRANSCRIPT_NAME_RE.search(candidate)
+    etag = match.group(1) if match else None
+    if etag and request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = _REVALIDATE_CACHE_CONTROL
+        return response
+
+    length, sha256 = _stream_text_stats(candidate)
 
     response = send_file(
         candidate,
         mimetype='text/plain',
         as_attachment=False,
-        download_name=candidate.name,
+        download_name=os.path.basename(candidate),
+        etag=etag or True,
         max_age=0,
     )
-    response.headers['Cache-Control'] = 'no-store'
+    response.headers['Cache-Control'] = _REVALIDATE_CACHE_CONTROL if etag else 'no-store'
     response.headers['X-Transcript-Length'] = str(length)
     response.headers['X-Transcript-Sha256'] = sha256
     return response
@@ -320,6 +600,11 @@ def get_transcript_file(filename: str):
 def transcribe():
     """Transcrit un fichier audio sans lancer le reste du pipeline."""
 
+    from .logic import build_canonical_transcript_text, spooled_upload, transcribe_audio_cached
+
+    if _audio_request_too_large():
+        return _handle_value_error(ValueError('audio_too_large'))
+
     file_key = None
     if 'audio' in request.files:
         file_key = 'audio'
@@ -330,20 +615,25 @@ def transcribe():
 
     audio_file = request.files[file_key]
     try:
-        transcript = transcribe_audio(audio_file, retries=3)
+        with spooled_upload(audio_file) as audio_path:
+            transcript = transcribe_audio_cached(audio_file, audio_path=audio_path, retries=3)
     except ValueError as exc:
         return _handle_value_error(exc)
     except Exception:
         return _handle_unexpected_error()
 
     canonical_text = build_canonical_transcript_text(transcript)
+    encoded = canonical_text.encode('utf-8')
     length = len(canonical_text)
-    sha256 = hashlib.sha256(canonical_text.encode('utf-8')).hexdigest()
-    fname = f"ps-{int(time.time() * 1000)}-{sha256[:8]}.txt"
+    # Le SHA-256 est exposé aux clients (``sha256``, ``X-Transcript-Sha256``) :
+    # le suffixe du nom de fichier en reprend les 8 premiers caractères plutôt
+    # que de calculer une seconde empreinte.
+    sha256 = hashlib.sha256(encoded).hexdigest()
+    fname = f"ps-{time.time_ns() // 1_000_000}-{sha256[:8]}.txt"
     storage_dir = _transcript_storage_dir()
     file_path = storage_dir / fname
-    with open(file_path, 'w', encoding='utf-8', newline='\n') as handle:
-        handle.write(canonical_text)
+    with open(file_path, 'wb') as handle:
+        handle.write(encoded)
 
     segments_count = len(transcript.segments or [])
     dur_raw = transcript.metadata.get('dur_raw') if isinstance(transcript.metadata, dict) else None
@@ -388,36 +678,19 @@ def transcribe():
 def build_plan():
     """Génère un plan et les extractions associées à partir d'une transcription."""
 
-    payload = request.get_json(silent=True) or {}
+    from .logic import format_plan_text, pack_plan_artifacts
+
+    try:
+        payload = _load_json_payload()
+    except ValueError as exc:
+        return _handle_value_error(exc)
     transcript = (payload.get('transcript') or '').strip()
     if not transcript:
         return _handle_value_error(ValueError('empty_transcript'))
 
-    plan_context_token = payload.get('planContext') or payload.get('plan_context')
-    artifacts = None
-    if plan_context_token:
-        try:
-            artifacts = unpack_plan_artifacts(plan_context_token)
-        except ValueError:
-            return _handle_value_error(ValueError('invalid_context'))
-
-    if artifacts is None:
-        plan_override = payload.get('planStructure') or payload.get('plan_structure')
-        if not isinstance(plan_override, dict):
-            plan_override = None
-        plan_text_input = payload.get('planText') or payload.get('plan')
-        segments = _extract_segments(payload)
-        try:
-            artifacts = compute_plan_artifacts(
-                transcript,
-                segments=segments,
-                plan_override=plan_override,
-                plan_text=plan_text_input,
-            )
-        except ValueError as exc:
-            return _handle_value_error(exc)
-        except Exception:
-            return _handle_unexpected_error()
+    artifacts, error_response = _resolve_artifacts(payload, transcript)
+    if error_response is not None:
+        return error_response
 
     context_token = pack_plan_artifacts(artifacts)
     data = {
@@ -439,42 +712,34 @@ def build_plan():
 def research():
     """Lance la recherche documentaire de manière indépendante."""
 
-    payload = request.get_json(silent=True) or {}
+    from .logic import (
+        load_recent_history_async,
+        pack_plan_artifacts,
+        pack_research_context,
+        run_research_stage,
+        summarize_research_for_ui,
+    )
+
+    try:
+        payload = _load_json_payload()
+    except ValueError as exc:
+        return _handle_value_error(exc)
     transcript = (payload.get('transcript') or '').strip()
     if not transcript:
         return _handle_value_error(ValueError('empty_transcript'))
 
-    plan_context_token = payload.get('planContext') or payload.get('plan_context')
-    artifacts = None
-    if plan_context_token:
-        try:
-            artifacts = unpack_plan_artifacts(plan_context_token)
-        except ValueError:
-            return _handle_value_error(ValueError('invalid_context'))
+    # L'historique est lu pendant la (re)construction éventuelle du plan.
+    patient_hint = payload.get('patient_name') or payload.get('patient') or payload.get('patient_id')
+    history_future = load_recent_history_async(str(patient_hint) if patient_hint else None)
 
-    if artifacts is None:
-        plan_override = payload.get('planStructure') or payload.get('plan_structure')
-        if not isinstance(plan_override, dict):
-            plan_override = None
-        plan_text_input = payload.get('planText') or payload.get('plan')
-        segments = _extract_segments(payload)
-        try:
-            artifacts = compute_plan_artifacts(
-                transcript,
-                segments=segments,
-                plan_override=plan_override,
-                plan_text=plan_text_input,
-            )
-        except ValueError as exc:
-            return _handle_value_error(exc)
-        except Exception:
-            return _handle_unexpected_error()
+    artifacts, error_response = _resolve_artifacts(payload, transcript)
+    if error_response is not None:
+        return error_response
 
-    patient_hint = payload.get('patientName') or payload.get('patient') or payload.get('patientId')
-    history = load_recent_history(str(patient_hint) if patient_hint else None)
+    history = history_future.result()
 
     filters = _extract_filter_params(payload)
-    limit_value = payload.get('searchLimit') or payload.get('limit')
+    limit_value = payload.get('search_limit') or payload.get('limit')
     limit_override: Optional[int] = None
     if limit_value is not None:
         try:
@@ -482,8 +747,8 @@ def research():
         except (TypeError, ValueError):
             return _handle_value_error(ValueError('invalid_search_limit'))
 
-    if is_true('RESEARCH_V2'):
-        query_override = payload.get('query') or payload.get('searchQuery')
+    if _research_v2_enabled():
+        query_override = payload.get('query')
         try:
             research_payload = _execute_research_v2(
                 artifacts,
@@ -533,43 +798,39 @@ def research():
 def generate_prompt():
     """Assemble le mail final et le prompt interne."""
 
-    payload = request.get_json(silent=True) or {}
+    from .logic import (
+        _derive_patient_name,
+        _should_use_tu,
+        load_recent_history_async,
+        pack_plan_artifacts,
+        pack_research_context,
+        run_prompt_stage,
+        run_research_stage,
+        unpack_research_context,
+    )
+
+    try:
+        payload = _load_json_payload()
+    except ValueError as exc:
+        return _handle_value_error(exc)
     transcript = (payload.get('transcript') or '').strip()
     if not transcript:
         return _handle_value_error(ValueError('empty_transcript'))
 
-    plan_context_token = payload.get('planContext') or payload.get('plan_context')
-    artifacts = None
-    if plan_context_token:
-        try:
-            artifacts = unpack_plan_artifacts(plan_context_token)
-        except ValueError:
-            return _handle_value_error(ValueError('invalid_context'))
+    # L'historique est lu pendant la (re)construction éventuelle du plan.
+    patient_options = _patient_options_from_payload(payload)
+    patient_name = _derive_patient_name(patient_options, None)
+    use_tu = _should_use_tu(patient_options)
+    history_future = load_recent_history_async(patient_name)
 
-    if artifacts is None:
-        plan_override = payload.get('planStructure') or payload.get('plan_structure')
-        if not isinstance(plan_override, dict):
-            plan_override = None
-        plan_text_input = payload.get('planText') or payload.get('plan')
-        segments = _extract_segments(payload)
-        try:
-            artifacts = compute_plan_artifacts(
-                transcript,
-                segments=segments,
-                plan_override=plan_override,
-                plan_text=plan_text_input,
-            )
-        except ValueError as exc:
-            return _handle_value_error(exc)
-        except Exception:
-            return _handle_unexpected_error()
+    artifacts, error_response = _resolve_artifacts(payload, transcript)
+    if error_response is not None:
+        return error_response
 
-    research_context_token = None
-    research_payload = payload.get('research') if isinstance(payload.get('research'), dict) else {}
-    if isinstance(research_payload, dict):
-        research_context_token = research_payload.get('context') or research_payload.get('contextToken')
+    research_payload = _normalize_payload(payload.get('research'))
+    research_context_token = research_payload.get('context')
     if not research_context_token:
-        research_context_token = payload.get('researchContext') or payload.get('research_context')
+        research_context_token = payload.get('research_context')
 
     if research_context_token:
         try:
@@ -579,13 +840,10 @@ def generate_prompt():
     else:
         research_result = None
 
-    patient_options = _patient_options_from_payload(payload)
-    patient_name = _derive_patient_name(patient_options, None)
-    use_tu = _should_use_tu(patient_options)
-    history = load_recent_history(patient_name)
+    history = history_future.result()
 
     filters = _extract_filter_params(payload)
-    limit_value = payload.get('searchLimit') or (research_payload.get('limit') if isinstance(research_payload, dict) else None)
+    limit_value = payload.get('search_limit') or research_payload.get('limit')
     limit_override: Optional[int] = None
     if limit_value is not None:
         try:
@@ -593,12 +851,8 @@ def generate_prompt():
         except (TypeError, ValueError):
             return _handle_value_error(ValueError('invalid_search_limit'))
 
-    if is_true('RESEARCH_V2'):
-        query_override = None
-        if isinstance(research_payload, dict):
-            query_override = research_payload.get('query') or research_payload.get('searchQuery')
-        if not query_override:
-            query_override = payload.get('query') or payload.get('searchQuery')
+    if _research_v2_enabled():
+        query_override = research_payload.get('query') or payload.get('query')
         if research_result is None or research_result.get('engine') != 'library_v2':
             try:
                 research_result = _execute_research_v2(
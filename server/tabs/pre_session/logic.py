@@ -2,6 +2,10 @@
 
 import re
 
+# Une seule passe : accolades, termes proscrits et blancs sont absorbés par
+# séquences ; une séquence contenant un blanc (groupe 1) devient une espace.
+_SANITIZE_RE = re.compile(r"(?:(\s)|[{}]|\b(?:tcc|json|échelles?|echelles?)\b)+", re.IGNORECASE)
+
 
 def _clean_text(value):
     if not value:
@@ -9,6 +13,14 @@ def _clean_text(value):
     return str(value).strip()
 
 
+def _sanitize_match(match):
+    return ' ' if match.group(1) is not None else ''
+
+
+def _sanitize(text):
+    return _SANITIZE_RE.sub(_sanitize_match, _clean_text(text)).strip()
+
+
 def generate_brief(prompt, params=None):
     """Generate a ready-to-copy prompt for ChatGPT Web.
 
@@ -38,67 +50,46 @@ def generate_brief(prompt, params=None):
     force_return = bool(params.get('forceReturn'))
     should_add_return = force_return or bool(patient_reply)
 
-    forbidden_pattern = re.compile(r"\b(tcc|json|échelles?|echelles?)\b", flags=re.IGNORECASE)
-
-    def sanitize(text):
-        cleaned = _clean_text(text)
-        cleaned = cleaned.replace('{', '').replace('}', '')
-        cleaned = forbidden_pattern.sub('', cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        return cleaned.strip()
-
-    sanitized_mail = sanitize(mail_body)
-    sanitized_reply = sanitize(patient_reply)
-    sanitized_instructions = sanitize(prompt_instructions)
+    sanitized_mail = _sanitize(mail_body)
+    sanitized_reply = _sanitize(patient_reply)
+    sanitized_instructions = _sanitize(prompt_instructions)
 
     synthesis_segments = [
         (
             "Prépare une analyse matérialiste et critique de la situation clinique à partir des échanges qui suivent, "
             "en soulignant les rapports sociaux et matériels impliqués."
-        )
-    ]
-
-    if sanitized_mail:
-        synthesis_segments.append(
+        ),
+        (
             f"Le courrier initial du ou de la thérapeute met en avant les éléments suivants : {sanitized_mail}."
-        )
-    else:
-        synthesis_segments.append("Aucun courrier initial n'est disponible ; reconstitue le contexte avec prudence.")
-
-    if sanitized_reply:
-        synthesis_segments.append(
+            if sanitized_mail
+            else "Aucun courrier initial n'est disponible ; reconstitue le contexte avec prudence."
+        ),
+        (
             f"La réponse du ou de la patient·e souligne : {sanitized_reply}."
-        )
-    else:
-        synthesis_segments.append(
-            "Le ou la patient·e n'a pas fourni de retour ; concentre-toi sur les données déjà connues."
-        )
-
-    if sanitized_instructions:
-        synthesis_segments.append(
+            if sanitized_reply
+            else "Le ou la patient·e n'a pas fourni de retour ; concentre-toi sur les données déjà connues."
+        ),
+        (
             f"Prends aussi en compte les consignes particulières suivantes : {sanitized_instructions}."
-        )
-
-    synthesis_segments.append(
-        "Garde un ton engagé, matérialiste et critique : relie systématiquement les symptômes aux conditions sociales, "
-        "matérielles et institutionnelles qui peuvent les produire ou les entretenir."
-    )
-
-    synthesis_segments.append(
-        "Écarte toute proposition fondée sur des outils de mesure chiffrée, sur des protocoles cognitivo-comportementaux "
-        "ou sur des formats de restitution sérialisés ; privilégie des recommandations ancrées dans la réalité matérielle."
-    )
-
-    if should_add_return and sanitized_reply:
-        synthesis_segments.append(
+            if sanitized_instructions
+            else ""
+        ),
+        (
+            "Garde un ton engagé, matérialiste et critique : relie systématiquement les symptômes aux conditions sociales, "
+            "matérielles et institutionnelles qui peuvent les produire ou les entretenir."
+        ),
+        (
+            "Écarte toute proposition fondée sur des outils de mesure chiffrée, sur des protocoles cognitivo-comportementaux "
+            "ou sur des formats de restitution sérialisés ; privilégie des recommandations ancrées dans la réalité matérielle."
+        ),
+        (
             "Commence par adresser un court message de retour au ou à la patient·e en réutilisant explicitement ses propres "
             "mots, puis enchaîne avec l'analyse critique."
-        )
-    else:
-        synthesis_segments.append(
-            "Si aucun retour n'est attendu, passe directement à l'analyse tout en rappelant les limites des informations "
+            if should_add_return and sanitized_reply
+            else "Si aucun retour n'est attendu, passe directement à l'analyse tout en rappelant les limites des informations "
             "disponibles."
-        )
+        ),
+    ]
 
     prompt_text = " ".join(segment for segment in synthesis_segments if segment).strip()
     return prompt_text
@@ -0,0 +1,78 @@
+"""Fixtures partagées par les tests de ``server/tests``."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+SERVICES_DIR = Path(__file__).resolve().parents[1] / "services"
+
+
+@lru_cache(maxsize=None)
+def _load_service_module(name: str) -> ModuleType:
+    """Charge ``server/services/<name>.py`` une seule fois par session."""
+
+    module_name = f"server.services.{name}"
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, SERVICES_DIR / f"{name}.py")
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Impossible de charger {module_name}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@lru_cache(maxsize=None)
+def _ensure_package(name: str) -> ModuleType:
+    """Enregistre un paquet vide ``name`` s'il n'est pas déjà importé."""
+
+    package = sys.modules.get(name)
+    if package is None:
+        package = ModuleType(name)
+        package.__path__ = []  # type: ignore[attr-defined]
+        sys.modules[name] = package
+    return package
+
+
+def _load_module(name: str, path: Path) -> ModuleType:
+    """Exécute ``path`` sous le nom pointé ``name``, paquets parents compris."""
+
+    parents = name.split(".")[:-1]
+    for package_name in accumulate(parents, lambda a, b: f"{a}.{b}"):
+        _ensure_package(package_name)
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Impossible de charger {name}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def load_module() -> Callable[[str, Path], ModuleType]:
+    return _load_module
+
+
+@pytest.fixture(scope="session")
+def library_search_mod() -> ModuleType:
+    return _load_service_module("library_search")
+
+
+@pytest.fixture(scope="session")
+def pii_guard_mod() -> ModuleType:
+    return _load_service_module("pii_guard")
+
+
+@pytest.fixture(scope="session")
+def research_queries_mod() -> ModuleType:
+    return _load_service_module("research_queries")
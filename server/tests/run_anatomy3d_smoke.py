@@ -5,12 +5,17 @@ from __future__ import annotations
 from typing import Final
 
 import requests
+from requests.adapters import HTTPAdapter
 
 BASE_URL: Final[str] = "http://127.0.0.1:1421"
 
+# Une seule session : les requêtes successives réutilisent la connexion.
+_SESSION: Final[requests.Session] = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 
 def _get(path: str) -> requests.Response:
-    response = requests.get(f"{BASE_URL}{path}", timeout=5)
+    response = _SESSION.get(f"{BASE_URL}{path}", timeout=5)
     response.raise_for_status()
     return response
 
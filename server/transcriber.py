@@ -11,7 +11,9 @@ transcriber will use Whisper via the OpenAI API.  Otherwise, it falls back
 to a simple mock that annotates the time range of each chunk.
 
 The default chunk length is 120 seconds with a 4‑second overlap.  Chunks
-are processed sequentially to limit resource usage.  Overlaps are left
+are transcribed concurrently by a small thread pool (four workers by
+default) since each one waits on a network round‑trip; the segments are
+reassembled in chronological order.  Overlaps are left
 intact in the concatenated transcript: some duplicated text may appear but
 no content is lost.
 
@@ -28,17 +30,26 @@ Example
 from __future__ import annotations
 
 import os
+import shutil
+import struct
 import subprocess
-import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
-    # The openai package is optional; if unavailable we will fall back to a stub.
-    from openai import OpenAI  # type: ignore
+    # mutagen is optional; it reads MP3/FLAC/M4A durations without ffprobe.
+    from mutagen import File as MutagenFile  # type: ignore
 except Exception:
-    OpenAI = None  # type: ignore
+    MutagenFile = None  # type: ignore
+
+# Resolved once: every chunk would otherwise walk PATH again.  The absolute
+# path also spares subprocess its own lookup.
+_FFMPEG = shutil.which("ffmpeg")
+_FFPROBE = shutil.which("ffprobe")
 
 
 @dataclass
@@ -60,6 +71,109 @@ class Segment:
     text: str
 
 
+def _fix_wav_sizes(data: bytes) -> bytes:
+    """Patch the RIFF and ``data`` chunk sizes of a WAV streamed by ffmpeg.
+
+    When writing to a pipe ffmpeg cannot seek back to fill in the sizes, so
+    the header carries placeholders.  They are recomputed from the captured
+    length so that :mod:`wave` and the Whisper API read the chunk correctly.
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return data
+    buf = bytearray(data)
+    struct.pack_into("<I", buf, 4, len(buf) - 8)
+    offset = 12
+    while offset + 8 <= len(buf):
+        chunk_id = bytes(buf[offset:offset + 4])
+        if chunk_id == b"data":
+            struct.pack_into("<I", buf, offset + 4, len(buf) - offset - 8)
+            break
+        (size,) = struct.unpack_from("<I", buf, offset + 4)
+        offset += 8 + size + (size & 1)
+    return bytes(buf)
+
+
+def _wav_duration(data: bytes) -> float:
+    """Return the duration of WAV bytes from the header alone, ``0.0`` if unreadable.
+
+    Only the ``fmt `` and ``data`` chunk headers are read; optional chunks
+    such as ``LIST`` (written by ffmpeg) are skipped by their size.
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return 0.0
+    byte_rate = 0
+    offset = 12
+    try:
+        while offset + 8 <= len(data):
+            chunk_id = data[offset:offset + 4]
+            (size,) = struct.unpack_from("<I", data, offset + 4)
+            if chunk_id == b"fmt " and offset + 20 <= len(data):
+                (byte_rate,) = struct.unpack_from("<I", data, offset + 16)
+            elif chunk_id == b"data":
+                size = min(size, len(data) - offset - 8)
+                return size / float(byte_rate) if byte_rate else 0.0
+            offset += 8 + size + (size & 1)
+    except struct.error:
+        return 0.0
+    return 0.0
+
+
+@lru_cache(maxsize=512)
+def _probe_duration_cached(path: str, mtime_ns: int, size: int) -> Optional[float]:
+    """Probe ``path``; ``mtime_ns`` and ``size`` only key the cache."""
+    duration = _read_header_duration(path)
+    if duration is not None:
+        return duration
+    return _ffprobe_duration(path)
+
+
+def _read_header_duration(path: str) -> Optional[float]:
+    """Read the duration from the container header without spawning ffprobe.
+
+    WAV is handled by the standard library; other formats (MP3, FLAC, M4A,
+    ...) go through ``mutagen`` when it is installed.
+    """
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as wf:
+                rate = wf.getframerate()
+                return wf.getnframes() / float(rate) if rate else None
+        except Exception:
+            pass
+    if MutagenFile is not None:
+        try:
+            info = getattr(MutagenFile(path), "info", None)
+            length = getattr(info, "length", None)
+            if length:
+                return float(length)
+        except Exception:
+            pass
+    return None
+
+
+def _ffprobe_duration(path: str) -> Optional[float]:
+    """Return the duration reported by ffprobe, or ``None`` if unavailable."""
+    if _FFPROBE:
+        try:
+            cmd = [
+                _FFPROBE,
+                '-v',
+                'error',
+                '-show_entries',
+                'format=duration',
+                '-of',
+                'default=noprint_wrappers=1:nokey=1',
+                path,
+            ]
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
+            value = result.stdout.strip()
+            return float(value) if value else None
+        except Exception:
+            pass
+    # Fallback: cannot determine duration
+    return None
+
+
 class Transcriber:
     """Facade class to handle audio transcription.
 
@@ -74,19 +188,78 @@ class Transcriber:
     api_key : str, optional
         Explicit OpenAI API key.  When omitted the library will look for
         ``OPENAI_API_KEY`` in the environment.
+    max_workers : int, optional
+        Number of chunks transcribed concurrently.  Defaults to 4; ``1``
+        restores strictly sequential processing.
     """
 
-    def __init__(self, model: str = "whisper-1", fallback_model: str = "whisper-1", api_key: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        model: str = "whisper-1",
+        fallback_model: str = "whisper-1",
+        api_key: Optional[str] = None,
+        max_workers: int = 4,
+    ) -> None:
         self.model = model
         self.fallback_model = fallback_model
-        # If OpenAI is available and a key is present, instantiate a client
-        if OpenAI is not None and (api_key or os.getenv("OPENAI_API_KEY")):
+        self.max_workers = max(1, int(max_workers))
+        self._http = None
+        self._openai = None
+        self.client = None
+        key = api_key or os.getenv("OPENAI_API_KEY")
+        if not key:
+            return
+        # The openai package is optional and heavy; it is only imported when
+        # a key is configured.  Without it we fall back to a stub.
+        try:
+            import openai  # type: ignore
+        except Exception:
+            return
+        self._openai = openai
+        try:
+            self._http = self._build_http_client()
+            if self._http is not None:
+                self.client = openai.OpenAI(api_key=key, http_client=self._http)
+        except Exception:
+            self.close()
+            self.client = None
+        if self.client is None:
             try:
-                self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+                self.client = openai.OpenAI(api_key=key)
             except Exception:
                 self.client = None
-        else:
-            self.client = None
+
+    def _build_http_client(self):
+        """Return a keep-alive HTTP client sized for the chunk thread pool.
+
+        Every chunk request reuses a pooled TLS connection instead of paying
+        a handshake.  ``None`` lets the SDK build its default client.
+        """
+        try:
+            # httpx ships with the openai SDK; used to size the connection pool.
+            import httpx  # type: ignore
+        except Exception:
+            return None
+        client_cls = getattr(self._openai, "DefaultHttpxClient", httpx.Client)
+        return client_cls(
+            limits=httpx.Limits(
+                max_keepalive_connections=self.max_workers * 2,
+                max_connections=self.max_workers * 4,
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        )
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections."""
+        http, self._http = self._http, None
+        if http is not None:
+            try:
+                http.close()
+            except Exception:
+                pass
+
+    def __del__(self) -> None:  # pragma: no cover - interpreter dependent
+        self.close()
 
     # Public API
     def transcribe_audio(self, path: Path, chunk_seconds: int = 120, overlap_seconds: int = 4) -> Dict[str, object]:
@@ -117,50 +290,49 @@ class Transcriber:
         if duration is None:
             # If duration cannot be determined, treat as a single chunk
             duration = chunk_seconds
-        segments: List[Segment] = []
         # Step through the file; ensure last chunk covers to end
         step = max(1.0, chunk_seconds - overlap_seconds)
+        bounds: List[Tuple[float, float]] = []
         current = 0.0
         while current < duration:
-            start = current
-            end = min(duration, current + chunk_seconds)
-            try:
-                audio_bytes = self._extract_chunk(path, start, end)
-                text = self._transcribe_bytes(audio_bytes)
-            except Exception as exc:
-                # In case of failure, include placeholder text but continue
-                text = f"[Transcription échouée de {start:.1f} à {end:.1f} s: {exc}]"
-            segments.append(Segment(start=start, end=end, text=text))
+            bounds.append((current, min(duration, current + chunk_seconds)))
             current += step
-        full_text = "\n".join(seg.text.strip() for seg in segments if seg.text.strip())
-        return {"text": full_text.strip(), "segments": segments, "duration": duration}
+        workers = min(self.max_workers, len(bounds)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._transcribe_chunk, path, start, end) for start, end in bounds]
+            segments: List[Segment] = []
+            lines: List[str] = []
+            for (start, end), future in zip(bounds, futures):
+                text = future.result()
+                segments.append(Segment(start=start, end=end, text=text))
+                stripped = text.strip()
+                if stripped:
+                    lines.append(stripped)
+        # Lines are already stripped and non-empty: no outer strip needed.
+        return {"text": "\n".join(lines), "segments": segments, "duration": duration}
 
     # Internal helpers
+    def _transcribe_chunk(self, path: Path, start: float, end: float) -> str:
+        """Extract and transcribe one chunk, never raising."""
+        try:
+            audio_bytes = self._extract_chunk(path, start, end)
+            return self._transcribe_bytes(audio_bytes)
+        except Exception as exc:
+            # In case of failure, include placeholder text but continue
+            return f"[Transcription échouée de {start:.1f} à {end:.1f} s: {exc}]"
+
     def _probe_duration(self, path: Path) -> Optional[float]:
-        """Return the duration of the audio in seconds using ffprobe.
+        """Return the duration of the audio in seconds.
 
-        If ffprobe is unavailable or an error occurs, ``None`` is returned.
+        Results are memoised on ``(path, mtime, size)`` so re-runs on the same
+        file skip the probe.  If the duration cannot be determined, ``None``
+        is returned.
         """
-        import shutil
-        if shutil.which('ffprobe'):
-            try:
-                cmd = [
-                    'ffprobe',
-                    '-v',
-                    'error',
-                    '-show_entries',
-                    'format=duration',
-                    '-of',
-                    'default=noprint_wrappers=1:nokey=1',
-                    str(path),
-                ]
-                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, text=True)
-                value = result.stdout.strip()
-                return float(value) if value else None
-            except Exception:
-                pass
-        # Fallback: cannot determine duration
-        return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return _probe_duration_cached(str(path), stat.st_mtime_ns, stat.st_size)
 
     def _extract_chunk(self, path: Path, start: float, end: float) -> bytes:
         """Extract a chunk of audio as bytes using ffmpeg.
@@ -183,18 +355,19 @@ class Transcriber:
         bytes
             Raw WAV data for the chunk.
         """
-        import shutil
         # Try to use ffmpeg if available
-        if shutil.which('ffmpeg'):
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tempname = tmp.name
+        if _FFMPEG:
             duration = max(0.0, end - start)
+            # ``-ss``/``-t`` placed before ``-i`` are input options: ffmpeg
+            # seeks in the container instead of decoding from the start, and
+            # ``-accurate_seek`` trims to the exact sample after the seek.
             cmd = [
-                'ffmpeg',
+                _FFMPEG,
                 '-loglevel',
                 'quiet',
                 '-ss',
                 f'{start}',
+                '-accurate_seek',
                 '-t',
                 f'{duration}',
                 '-i',
@@ -205,18 +378,48 @@ class Transcriber:
                 '16000',
                 '-f',
                 'wav',
-                tempname,
+                'pipe:1',
             ]
-            subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False)
-            data = Path(tempname).read_bytes()
-            try:
-                os.unlink(tempname)
-            except Exception:
-                pass
-            return data
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False)
+            return _fix_wav_sizes(result.stdout)
         # Fallback: read full file bytes without cutting
         return Path(path).read_bytes()
 
+    def _whisper_request(self, model: str, audio_bytes: bytes) -> str:
+        """Send one chunk to the Whisper API with ``model``."""
+        # The SDK accepts raw bytes in the file tuple: no BytesIO copy needed.
+        response = self.client.audio.transcriptions.create(  # type: ignore[attr-defined]
+            model=model,
+            file=("chunk.wav", audio_bytes, "audio/wav"),
+            response_format="text",
+            language="fr",
+        )
+        # The response is a str, a dict or an object depending on SDK
+        if isinstance(response, str):
+            return response
+        if isinstance(response, dict):
+            return response.get("text", "")
+        return getattr(response, "text", "")
+
+    def _should_retry(self, exc: Exception) -> bool:
+        """Tell whether a failed Whisper call is worth a second attempt.
+
+        Timeouts, connection errors, rate limits and 5xx responses are
+        transient.  Authentication failures and oversized payloads are not,
+        nor is any other 4xx when the fallback model is the same model.
+        """
+        openai = self._openai
+        if openai is None:
+            return True
+        if isinstance(exc, openai.APIConnectionError):  # includes timeouts
+            return True
+        if isinstance(exc, openai.APIStatusError):
+            status = exc.status_code
+            if status >= 500 or status == 429:
+                return True
+            return self.fallback_model != self.model and status not in (401, 403, 413)
+        return False
+
     def _transcribe_bytes(self, audio_bytes: bytes) -> str:
         """Transcribe a single audio chunk.
 
@@ -237,44 +440,14 @@ class Transcriber:
         if self.client is not None:
             # Use OpenAI Whisper via the audio API
             try:
-                import io
-                buf = io.BytesIO(audio_bytes)
-                response = self.client.audio.transcriptions.create(  # type: ignore[attr-defined]
-                    model=self.model,
-                    file=("chunk.wav", buf, "audio/wav"),
-                    response_format="text",
-                    language="fr",
-                )
-                # The response is either a dict or an object depending on SDK
-                if isinstance(response, dict):
-                    return response.get("text", "")
-                return getattr(response, "text", "")
-            except Exception:
-                # Try fallback model once
-                try:
-                    import io
-                    buf = io.BytesIO(audio_bytes)
-                    response = self.client.audio.transcriptions.create(  # type: ignore[attr-defined]
-                        model=self.fallback_model,
-                        file=("chunk.wav", buf, "audio/wav"),
-                        response_format="text",
-                        language="fr",
-                    )
-                    if isinstance(response, dict):
-                        return response.get("text", "")
-                    return getattr(response, "text", "")
-                except Exception:
-                    pass
+                return self._whisper_request(self.model, audio_bytes)
+            except Exception as exc:
+                # Try fallback model once, unless the error is terminal
+                if self._should_retry(exc):
+                    try:
+                        return self._whisper_request(self.fallback_model, audio_bytes)
+                    except Exception:
+                        pass
         # Mock transcription when OpenAI is unavailable or fails
         # Use the length of the audio to build a placeholder string
-        import wave
-        import io
-
-        try:
-            with wave.open(io.BytesIO(audio_bytes), "rb") as wf:
-                frames = wf.getnframes()
-                rate = wf.getframerate()
-                duration = frames / float(rate) if rate else 0.0
-        except Exception:
-            duration = 0.0
-        return f"[audio {duration:.1f}s]"
+        return f"[audio {_wav_duration(audio_bytes):.1f}s]"
@@ -1,6 +1,8 @@
 import unicodedata, re
 
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9]+")
+
 def slugify(name: str) -> str:
-    s = unicodedata.normalize("NFKD", name).encode("ascii","ignore").decode("ascii")
-    s = re.sub(r"[^a-zA-Z0-9]+","-", s).strip("-").lower()
+    s = name if name.isascii() else unicodedata.normalize("NFKD", name).encode("ascii","ignore").decode("ascii")
+    s = _NON_ALNUM.sub("-", s).strip("-").lower()
     return s or "patient"
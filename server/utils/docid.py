@@ -9,13 +9,13 @@ from __future__ import annotations
 import logging
 import os
 import re
+from functools import lru_cache
 from os import PathLike
 from pathlib import Path
 
 LOGGER = logging.getLogger(__name__)
 
-_DOC_ID_RE = re.compile(r"^(?P<algo>[a-z0-9]{3,15}):(?P<hash>[a-f0-9]{32,128})$")
-_FORBIDDEN_CHARS = set('<>:"/\\|?*')
+_DOC_ID_RE = re.compile(r"^(?P<algo>[a-z0-9]{3,15}):(?P<hash>[a-f0-9]{32,128})$", re.ASCII)
 _WINDOWS_RESERVED = {
     "CON",
     "PRN",
@@ -44,20 +44,6 @@ def parse_doc_id(doc_id: str) -> tuple[str, str]:
     return algo, digest
 
 
-def _ensure_safe_component(component: str, *, name: str) -> str:
-    if any(ord(char) < 32 for char in component):
-        raise ValueError(f"composant {name} contient des caractères de contrôle")
-    if any(char in _FORBIDDEN_CHARS for char in component):
-        raise ValueError(f"composant {name} contient un caractère réservé")
-    upper = component.upper()
-    if upper in _WINDOWS_RESERVED:
-        raise ValueError(f"composant {name} correspond à un nom réservé Windows")
-    if component.endswith(" ") or component.endswith("."):
-        # Windows interdit les espaces ou points terminaux.
-        raise ValueError(f"composant {name} ne doit pas se terminer par espace ou point")
-    return component
-
-
 def doc_id_to_fs_path(root: Path | str | PathLike[str], doc_id: str, shard: bool = True) -> Path:
     """Convertit un ``doc_id`` en chemin système.
 
@@ -68,24 +54,30 @@ def doc_id_to_fs_path(root: Path | str | PathLike[str], doc_id: str, shard: bool
             ``algo/h0h1/h2h3/hash`` pour limiter la densité d'un dossier.
     """
 
-    algo, digest = parse_doc_id(doc_id)
-    algo = _ensure_safe_component(algo, name="algo")
-    digest = _ensure_safe_component(digest, name="hash")
-
-    parts: list[str] = [algo]
-    if shard and len(digest) >= 4:
-        parts.extend([digest[0:2], digest[2:4]])
-    elif shard and len(digest) >= 2:
-        parts.append(digest[0:2])
-    parts.append(digest)
-
-    fs_path = Path(root)
-    for part in parts:
-        fs_path /= part
-    LOGGER.debug("doc_id_to_fs_path", extra={"doc_id": doc_id, "fs_path": str(fs_path), "shard": shard})
+    fs_path = _doc_id_to_fs_path(os.fspath(root), doc_id, shard)
+    if LOGGER.isEnabledFor(logging.DEBUG):
+        LOGGER.debug("doc_id_to_fs_path", extra={"doc_id": doc_id, "fs_path": str(fs_path), "shard": shard})
     return fs_path
 
 
+@lru_cache(maxsize=4096)
+def _doc_id_to_fs_path(root: str, doc_id: str, shard: bool) -> Path:
+    # Un même document est résolu plusieurs fois par ingestion (PDF brut,
+    # extraction, manifeste) : validation et construction du ``Path`` une fois.
+    # Les ``doc_id`` invalides lèvent et ne sont donc pas mis en cache.
+    algo, digest = parse_doc_id(doc_id)
+    # ``_DOC_ID_RE`` restreint déjà les composants à ``[a-z0-9]`` et
+    # ``[a-f0-9]`` : ni caractère de contrôle, ni caractère réservé, ni point
+    # final.  Seul ``algo`` peut encore épeler un nom réservé (``con``, ``lpt1``).
+    if algo.upper() in _WINDOWS_RESERVED:
+        raise ValueError("composant algo correspond à un nom réservé Windows")
+
+    if shard:
+        # ``_DOC_ID_RE`` garantit au moins 32 caractères hexadécimaux.
+        return Path(root, algo, digest[0:2], digest[2:4], digest)
+    return Path(root, algo, digest)
+
+
 def legacy_fs_path(root: Path | str | PathLike[str], doc_id: str) -> Path:
     """Reconstitue le chemin historique ``algo:hash`` pour compatibilité."""
 
@@ -16,9 +16,29 @@ Points d'extension :
 from __future__ import annotations
 
 import re
-from typing import Iterable
-
-_NON_BREAKING_BEFORE = {":", "!", "?", ";"}
+from functools import partial
+
+_NON_BREAKING_BEFORE = (":", "!", "?", ";")
+
+# Motifs compilés une fois à l'import : ces helpers tournent sur chaque champ
+# des cartes de recherche.  Le texte vient d'un LLM : aucun motif ne laisse
+# deux quantificateurs se disputer les mêmes blancs (retour arrière
+# polynomial), le coût reste linéaire.
+# Second membre : tiret isolé, sans ponctuation fermante avant le suivant.
+# ``(?<!\s)`` n'essaie une série de blancs qu'à partir de son début.
+_LONG_DASH_RE = re.compile(r"(?<!\s)\s*—\s*(?P<inner>(?:[^—\s][^—]*?)??)(?P<closing>[\.!?,;:]|$)|—")
+# Citation : bornée par le guillemet suivant, sans blanc aux extrémités.
+_STRAIGHT_QUOTES_RE = re.compile(r'"\s*([^\s"](?:[^"\n]*[^\s"])?)\s*"')
+# Droits et typographiques appariés en une passe ; un guillemet isolé reste tel quel.
+_ENGLISH_QUOTES_RE = re.compile(r'["“”]\s*([^\s"“”](?:[^"“”\n]*[^\s"“”])?)\s*["“”]')
+_FRENCH_QUOTES_RE = re.compile(r"«\s*([^\s«»](?:[^«»\n]*[^\s«»])?)\s*»")
+_MULTISPACE_RE = re.compile(r"\s+")
+# Caractères qu'au moins une règle réécrit (hors blancs).
+_TRIGGER_CHARS = ("—", '"', "“", "”", *_NON_BREAKING_BEFORE)
+# Une seule passe pour toutes les ponctuations doubles.
+_NBSP_RE = re.compile(
+    r"\s*([" + "".join(re.escape(mark) for mark in _NON_BREAKING_BEFORE) + "])"
+)
 
 
 def _replace_long_dashes(text: str) -> str:
@@ -30,35 +50,55 @@ def _replace_long_dashes(text: str) -> str:
     suivie d'un espace, et une parenthèse fermante est ajoutée en fin de segment.
     """
 
-    def _replace(match: re.Match[str]) -> str:
-        inner = match.group("inner").strip()
-        closing = match.group("closing") or ""
-        if inner:
-            return f" ({inner}){closing}"
-        return f" ({closing}".rstrip()
+    return _LONG_DASH_RE.sub(_long_dash_replacement, text)
+
 
-    pattern = re.compile(r"\s*—\s*(?P<inner>[^—]*?)(?P<closing>[\.!?,;:]|$)")
-    result = pattern.sub(_replace, text)
-    return result.replace("—", " (")
+def _long_dash_replacement(match: re.Match[str]) -> str:
+    if match.group("inner") is None:
+        return " ("
+    inner = match.group("inner").strip()
+    closing = match.group("closing") or ""
+    if inner:
+        return f" ({inner}){closing}"
+    return f" ({closing}".rstrip()
 
 
 def normalize_punctuation(text: str) -> str:
-    """Applique une normalisation typographique française légère."""
+    """Applique une normalisation typographique française légère.
+
+    Les règles s'appliquent dans un ordre significatif : les guillemets sont
+    convertis à l'intérieur des incises produites par les tirets, et les
+    espaces insécables sont posées après la fusion des blancs.  Elles ne
+    peuvent donc pas être réunies en une seule alternative ``re`` : une
+    correspondance consommerait le texte qu'une règle suivante doit réécrire.
+    """
 
     if not text:
         return ""
     value = str(text)
-    value = _replace_long_dashes(value)
+    # Texte déjà propre : seuls des espaces simples (``isprintable`` écarte les
+    # autres blancs) et aucun caractère déclencheur.
+    if (
+        value.isprintable()
+        and "  " not in value
+        and not any(char in value for char in _TRIGGER_CHARS)
+    ):
+        return value.strip()
+    # Chaque règle n'est appliquée que si son caractère déclencheur est présent :
+    # la plupart des sorties LLM n'ont ni tiret long ni guillemet anglais.
+    if "—" in value:
+        value = _replace_long_dashes(value)
     # Guillemets droits ou typographiques → guillemets français
-    value = re.sub(r'"\s*(.+?)\s*"', r'« \1 »', value)
-    value = re.sub(r"[“”]\s*(.+?)\s*[“”]", r"« \1 »", value)
-    # Supprimer espaces multiples
-    value = re.sub(r"\s+", " ", value)
+    if '"' in value or "“" in value or "”" in value:
+        value = _ENGLISH_QUOTES_RE.sub(r"« \1 »", value)
+    # Supprimer espaces multiples (``isprintable`` repère tout autre blanc)
+    if "  " in value or not value.isprintable():
+        value = _MULTISPACE_RE.sub(" ", value)
     # Restaurer sauts de ligne
     value = value.replace(" \n", "\n").replace("\n ", "\n")
     # Espaces insécables avant ponctuation double
-    for mark in _NON_BREAKING_BEFORE:
-        value = re.sub(fr"\s*{re.escape(mark)}", f"\u00a0{mark}", value)
+    if any(mark in value for mark in _NON_BREAKING_BEFORE):
+        value = _NBSP_RE.sub("\u00a0\\1", value)
     value = value.replace("\u00a0 ", "\u00a0")
     return value.strip()
 
@@ -70,27 +110,24 @@ def trim_quotes(text: str, max_words: int = 10) -> str:
         raise ValueError("max_words doit être > 0")
     if not text:
         return ""
+    if "«" not in text and '"' not in text:
+        return text
+
+    replacement = partial(_quote_replacement, max_words=max_words)
+    updated = _FRENCH_QUOTES_RE.sub(replacement, text)
+    return _STRAIGHT_QUOTES_RE.sub(replacement, updated)
+
+
+def _trim(segment: str, max_words: int) -> str:
+    # Les motifs excluent déjà les blancs aux extrémités de ``segment``.
+    words = segment.split(maxsplit=max_words)
+    if len(words) <= max_words:
+        return segment
+    return " ".join(words[:max_words]) + "…"
+
 
-    def _trim(segment: str) -> str:
-        words = [word for word in segment.strip().split() if word]
-        if len(words) <= max_words:
-            return segment.strip()
-        shortened = " ".join(words[:max_words]) + "…"
-        return shortened
-
-    def _replace_quotes(matches: Iterable[re.Match[str]]) -> str:
-        updated = text
-        for match in matches:
-            inner = match.group(1)
-            trimmed = _trim(inner)
-            updated = updated.replace(match.group(0), f"« {trimmed} »")
-        return updated
-
-    french_pattern = re.finditer(r"«\s*(.+?)\s*»", text)
-    updated = _replace_quotes(french_pattern)
-    straight_pattern = re.finditer(r'"\s*(.+?)\s*"', updated)
-    updated = _replace_quotes(straight_pattern)
-    return updated
+def _quote_replacement(match: re.Match[str], max_words: int) -> str:
+    return f"« {_trim(match.group(1), max_words)} »"
 
 
 __all__ = ["normalize_punctuation", "trim_quotes"]
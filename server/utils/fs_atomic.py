@@ -3,25 +3,67 @@
 from __future__ import annotations
 
 import os
-import uuid
+import tempfile
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable
+from typing import BinaryIO, Callable, Iterator, Tuple
 
 from .docid import ensure_dir
 
 Writer = Callable[[Path], None]
 
+# Taille maximale d'un ``os.write`` : les gros assets partent par tranches.
+_WRITE_CHUNK = 1 << 20
+
+
+@lru_cache(maxsize=256)
+def _ensure_tmp_dir(parent: str) -> Path:
+    """Crée une fois par processus le dossier ``tmp`` de ``parent`` (et ``parent``)."""
+
+    return ensure_dir(Path(parent) / "tmp")
+
 
 def _prepare_tmp_path(target: Path) -> Path:
     """Retourne un chemin temporaire dans ``tmp`` pour une écriture atomique."""
 
     final_path = Path(target)
-    parent = ensure_dir(final_path.parent)
-    tmp_dir = ensure_dir(parent / "tmp")
-    tmp_name = f"{final_path.name}.{uuid.uuid4().hex}.tmp"
+    parent = str(final_path.parent)
+    tmp_dir = _ensure_tmp_dir(parent)
+    if not os.path.isdir(tmp_dir):
+        # Dossier supprimé depuis sa mise en cache : on le recrée.
+        _ensure_tmp_dir.cache_clear()
+        tmp_dir = _ensure_tmp_dir(parent)
+    tmp_name = f"{final_path.name}.{os.urandom(8).hex()}.tmp"
     return tmp_dir / tmp_name
 
 
+@contextmanager
+def sibling_temp_file(path: Path | str) -> Iterator[Tuple[BinaryIO, Path]]:
+    """Ouvre un temporaire caché ``.{nom}.*.tmp`` à côté de ``path``.
+
+    Pour les arborescences servies telles quelles, où un dossier ``tmp``
+    serait exposé.  À la sortie du bloc, le fichier est synchronisé et passé
+    en 0644 (``mkstemp`` le crée en 0600) ; l'appelant le renomme ensuite.
+    En cas d'exception, il est supprimé.
+    """
+
+    final_path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=ensure_dir(final_path.parent), prefix=f".{final_path.name}.", suffix=".tmp"
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            yield handle, tmp_path
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_path, 0o644)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def atomic_write(path: Path | str, writer: Writer) -> Path:
     """Écrit un fichier de manière atomique en utilisant ``os.replace``."""
 
@@ -32,19 +74,71 @@ def atomic_write(path: Path | str, writer: Writer) -> Path:
     return final_path
 
 
+def _write_fd(tmp_path: Path, view: memoryview) -> None:
+    """Écrit ``view`` dans ``tmp_path`` par descripteur, puis ``fsync``."""
+
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        offset = 0
+        while offset < len(view):
+            offset += os.write(fd, view[offset:offset + _WRITE_CHUNK])
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _has_content(path: Path, view: memoryview) -> bool:
+    """Indique si ``path`` contient déjà exactement ``view``, lu par tranches."""
+
+    try:
+        if os.stat(path).st_size != len(view):
+            return False
+        with open(path, "rb") as handle:
+            offset = 0
+            while offset < len(view):
+                chunk = handle.read(_WRITE_CHUNK)
+                if not chunk or chunk != view[offset:offset + len(chunk)]:
+                    return False
+                offset += len(chunk)
+    except OSError:
+        return False
+    return True
+
+
 def atomic_write_text(path: Path | str, data: str, *, encoding: str = "utf-8") -> Path:
     """Écrit du texte de manière atomique."""
 
-    def _writer(tmp_path: Path) -> None:
-        tmp_path.write_text(data, encoding=encoding)
+    return atomic_write_bytes(path, data.encode(encoding))
 
-    return atomic_write(path, _writer)
 
+def atomic_write_bytes(
+    path: Path | str, data: bytes | bytearray | memoryview, *, sibling: bool = False
+) -> Path:
+    """Écrit des octets de manière atomique.
 
-def atomic_write_bytes(path: Path | str, data: bytes) -> Path:
-    """Écrit des octets de manière atomique."""
+    Un fichier déjà identique n'est pas réécrit : les réindexations
+    reproduisent surtout des contenus inchangés.  ``sibling`` prépare le
+    fichier via :func:`sibling_temp_file` plutôt que dans ``tmp``.
+    """
 
-    def _writer(tmp_path: Path) -> None:
-        tmp_path.write_bytes(data)
-
-    return atomic_write(path, _writer)
+    final_path = Path(path)
+    view = memoryview(data).cast("B")
+    if _has_content(final_path, view):
+        return final_path
+    if sibling:
+        with sibling_temp_file(final_path) as (handle, tmp_path):
+            handle.write(view)
+        try:
+            os.replace(tmp_path, final_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return final_path
+    tmp_path = _prepare_tmp_path(final_path)
+    try:
+        _write_fd(tmp_path, view)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, final_path)
+    return final_path
@@ -0,0 +1,13 @@
+"""Verrou partagé par tous les appels à pypdfium2.
+
+PDFium n'est pas thread-safe : l'ingestion de la Bibliothèque (pool de
+threads) et l'aperçu des factures ne doivent jamais l'appeler en parallèle.
+"""
+
+from __future__ import annotations
+
+import threading
+
+PDFIUM_LOCK = threading.Lock()
+
+__all__ = ["PDFIUM_LOCK"]
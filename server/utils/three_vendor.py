@@ -4,15 +4,43 @@ from __future__ import annotations
 
 import base64
 import logging
+from functools import lru_cache
 from pathlib import Path
 
+from .fs_atomic import atomic_write_bytes
+
 LOGGER = logging.getLogger(__name__)
 
 
 def ensure_draco_decoder(static_root: str | Path) -> Path | None:
-    """Génère ``draco_decoder.wasm`` à partir de la sauvegarde base64 si nécessaire."""
+    """Génère ``draco_decoder.wasm`` à partir de la sauvegarde base64 si nécessaire.
+
+    Le chemin est mémorisé par ``static_root`` dès qu'il est disponible ; un
+    échec n'est pas mémorisé et sera retenté à l'appel suivant.
+    """
+
+    try:
+        return _draco_decoder_path(str(static_root))
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=8)
+def _draco_decoder_path(static_root: str) -> Path:
+    # ``lru_cache`` ne mémorise pas les exceptions : seul un succès est figé.
+    wasm_path = _materialize_draco_decoder(Path(static_root))
+    if wasm_path is None:
+        raise FileNotFoundError("draco_decoder.wasm")
+    return wasm_path
+
+
+ensure_draco_decoder.cache_clear = _draco_decoder_path.cache_clear  # type: ignore[attr-defined]
+
+
+def _materialize_draco_decoder(static_root: Path) -> Path | None:
+    """Retourne le ``.wasm``, en le décodant depuis l'export base64 au besoin."""
 
-    base = Path(static_root) / "vendor" / "three" / "examples" / "jsm" / "libs" / "draco"
+    base = static_root / "vendor" / "three" / "examples" / "jsm" / "libs" / "draco"
     wasm_path = base / "draco_decoder.wasm"
     if wasm_path.exists():
         return wasm_path
@@ -21,13 +49,13 @@ def ensure_draco_decoder(static_root: str | Path) -> Path | None:
         LOGGER.warning("draco_decoder.wasm manquant et aucun export base64 disponible")
         return None
     try:
-        data = base64.b64decode(base64_path.read_text(encoding="utf-8"))
+        data = base64.b64decode(base64_path.read_bytes())
     except Exception as exc:  # pragma: no cover - logging uniquement
         LOGGER.warning("Décodage base64 impossible pour draco_decoder.wasm: %s", exc)
         return None
     try:
-        base.mkdir(parents=True, exist_ok=True)
-        wasm_path.write_bytes(data)
+        # Voisin caché plutôt qu'un dossier ``tmp/`` : l'arborescence est servie statiquement.
+        atomic_write_bytes(wasm_path, data, sibling=True)
     except OSError as exc:  # pragma: no cover - logging uniquement
         LOGGER.warning("Écriture impossible pour draco_decoder.wasm: %s", exc)
         return None
@@ -0,0 +1,22 @@
+"""Fixtures partagées par les suites de ``tests``."""
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def shared_app():
+    """Application Flask construite une seule fois pour toute la session."""
+
+    # Import tardif : la collecte des suites sans Flask ne paie pas l'amorçage.
+    from server import create_app
+
+    app = create_app()
+    app.config.update({"TESTING": True})
+    return app
+
+
+@pytest.fixture()
+def client(shared_app):
+    with shared_app.test_client() as client:
+        yield client
@@ -8,7 +8,7 @@ from modules.research_v2.sources import SourceRegistry, load_registry
 
 REGISTRY = load_registry()
 POLICY = load_policy()
-NOW = datetime.utcnow()
+NOW = datetime(2025, 1, 1)
 
 
 def build_doc(url: str, content: str, days_old: int = 10):
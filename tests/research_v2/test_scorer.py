@@ -8,7 +8,7 @@ from modules.research_v2.sources import SourceRegistry, load_registry
 
 POLICY = load_policy()
 REGISTRY = load_registry()
-NOW = datetime.utcnow()
+NOW = datetime(2025, 1, 1)
 
 
 def make_doc(url: str, jurisdiction: str = "FR", days_old: int = 30):
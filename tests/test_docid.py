@@ -57,6 +57,12 @@ def test_doc_id_to_fs_path_no_shard(tmp_path: Path):
     assert fs_path == tmp_path / "sha256" / ("1" * 64)
 
 
+@pytest.mark.parametrize("algo", ["con", "lpt1", "nul"])
+def test_doc_id_to_fs_path_rejects_reserved_algo(algo, tmp_path: Path):
+    with pytest.raises(ValueError):
+        doc_id_to_fs_path(tmp_path, f"{algo}:" + "a" * 32)
+
+
 @pytest.mark.parametrize("platform", ["posix", "nt"])
 def test_legacy_fs_path(platform, monkeypatch, tmp_path: Path):
     doc_id = "sha256:" + "1" * 64
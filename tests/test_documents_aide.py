@@ -1,33 +1,31 @@
+import dataclasses
 from pathlib import Path
 
 import pytest
 
-import os
 import sys
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
 
-from server import create_app
 
+@pytest.fixture(autouse=True)
+def documents_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Redirige PDF et historique des patients vers ``tmp_path``.
 
-@pytest.fixture()
-def client():
-    app = create_app()
-    app.config.update({'TESTING': True})
-    with app.test_client() as client:
-        yield client
+    L'application est partagée par la session : rien n'est écrit dans le
+    dossier ``instance`` du dépôt et ``tmp_path`` est nettoyé par pytest.
+    """
 
+    from server.tabs.documents_aide import storage
 
-def _cleanup_patient_docs(patient_id: str):
-    base_dir = Path(__file__).resolve().parents[1]
-    docs_dir = base_dir / 'instance' / 'documents' / patient_id
-    if docs_dir.exists():
-        for path in docs_dir.glob('*'):
-            try:
-                if path.is_file():
-                    path.unlink()
-            except OSError:
-                pass
+    def _patient_dir(patient_id: str) -> Path:
+        target = tmp_path / 'documents' / patient_id
+        target.mkdir(parents=True, exist_ok=True)
+        return target
+
+    monkeypatch.setattr(storage, '_patient_dir', _patient_dir)
+    return tmp_path / 'documents'
 
 
 def test_modules_listing(client):
@@ -64,8 +62,7 @@ def test_context_and_assess(client):
     assert any(rec['id'] == 'micro_sensory_breaks' for rec in assess_data['recommendations'])
 
 
-def test_generate_document_success(client):
-    _cleanup_patient_docs('p1')
+def test_generate_document_success(client, documents_dir):
     payload = {
         'patient': {'id': 'p1', 'name': 'Caroline', 'gender': 'feminine'},
         'modules': ['spoon_theory', 'somatic_breaks'],
@@ -81,32 +78,38 @@ def test_generate_document_success(client):
     file_url = data['file_url']
     assert file_url.startswith('/api/documents-aide/download/')
     filename = file_url.rsplit('/', 1)[-1]
-    base_dir = Path(__file__).resolve().parents[1]
-    pdf_path = base_dir / 'instance' / 'documents' / 'p1' / filename
-    assert pdf_path.exists()
-    _cleanup_patient_docs('p1')
-
-
-def test_generate_rejects_editorial_terms(client):
-    base_dir = Path(__file__).resolve().parents[1]
-    module_path = base_dir / 'library' / 'modules' / 'spoon_theory.md'
-    original_content = module_path.read_text(encoding='utf-8')
-    try:
-        module_path.write_text(original_content + '\n\nComplexe d\'Œdipe cité pour test.', encoding='utf-8')
-        payload = {
-            'patient': {'id': 'p1', 'name': 'Caroline', 'gender': 'feminine'},
-            'modules': ['spoon_theory'],
-            'langage': 'vous',
-            'gender': 'feminine',
-        }
-        response = client.post('/api/documents-aide', json=payload)
-        assert response.status_code == 422
-        data = response.get_json()
-        assert data['success'] is False
-        assert data['error'] == 'validation_failed'
-    finally:
-        module_path.write_text(original_content, encoding='utf-8')
-        _cleanup_patient_docs('p1')
+    assert (documents_dir / 'p1' / filename).exists()
+
+
+def test_generate_rejects_editorial_terms(client, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from server.tabs.documents_aide import routes
+
+    original_get_tool = routes.get_tool
+
+    def _get_tool_with_proscribed_term(module_id: str):
+        # Copie altérée du module : le fichier du dépôt reste intact.
+        tool = original_get_tool(module_id)
+        if tool is None or tool.id != 'spoon_theory':
+            return tool
+        altered = tmp_path / tool.file.name
+        altered.write_text(
+            tool.file.read_text(encoding='utf-8') + '\n\nComplexe d\'Œdipe cité pour test.',
+            encoding='utf-8',
+        )
+        return dataclasses.replace(tool, file=altered)
+
+    monkeypatch.setattr(routes, 'get_tool', _get_tool_with_proscribed_term)
+    payload = {
+        'patient': {'id': 'p1', 'name': 'Caroline', 'gender': 'feminine'},
+        'modules': ['spoon_theory'],
+        'langage': 'vous',
+        'gender': 'feminine',
+    }
+    response = client.post('/api/documents-aide', json=payload)
+    assert response.status_code == 422
+    data = response.get_json()
+    assert data['success'] is False
+    assert data['error'] == 'validation_failed'
 
 
 def test_level_alignment_penalizes_score(client):
@@ -1,4 +1,3 @@
-import json
 from pathlib import Path
 
 import pytest
@@ -20,7 +19,7 @@ def client(tmp_path_factory):
 def test_post_session_json(client):
     transcript = "Je rencontre des difficultés au travail et nous avons discuté des ressources disponibles."
     payload = {"transcript": transcript, "prenom": "Bob", "register": "vous"}
-    res = client.post('/post_session', data=json.dumps(payload), content_type='application/json')
+    res = client.post('/post_session', json=payload)
     assert res.status_code == 200
     data = res.get_json()
     assert data['plan']
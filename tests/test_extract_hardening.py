@@ -1,8 +1,26 @@
+from functools import lru_cache
+
 import pytest
 
 from server.post_v2.extract_session import extract_session_facts
 
 
+@lru_cache(maxsize=8)
+def _facts(transcript: str, prenom: str = "Alice", date: str = "2024-02-01"):
+    """Extraction mémoïsée : une entrée répétée n'est analysée qu'une fois."""
+
+    return extract_session_facts(transcript, prenom, date)
+
+
+# Phrases communes aux transcriptions sur le travail.
+_WORK_DISTRESS = (
+    "Je me sens perdue depuis plusieurs semaines et je n'arrive plus à structurer mes journées, tout mon travail en pâtit et je m'inquiète de perdre mon poste. "
+    "Je passe mes nuits à ruminer et je me réveille très fatiguée, je ne sais pas comment tenir au travail sans soutien. "
+    "J'aimerais savoir si on peut adapter mon horaire de travail pour que je récupère un peu ? "
+)
+_WORKLOAD = "Je voudrais expliquer à mon employeur que ma charge de travail actuelle n'est pas soutenable et que je risque de craquer si rien ne change."
+
+
 @pytest.mark.parametrize(
     "transcript",
     [
@@ -11,7 +29,7 @@ from server.post_v2.extract_session import extract_session_facts
     ],
 )
 def test_no_meds_detected_when_not_in_lexicon(transcript):
-    facts = extract_session_facts(transcript, "Alice", "2024-02-01")
+    facts = _facts(transcript)
     assert facts.meds == []
 
 
@@ -21,7 +39,7 @@ def test_asks_include_full_question():
         "J'aimerais savoir si on peut adapter mon horaire de travail pour que je récupère un peu ? "
         "Je prends des notes pour ne rien oublier."
     )
-    facts = extract_session_facts(transcript, "Alice", "2024-02-01")
+    facts = _facts(transcript)
     assert facts.asks, "La liste des questions devrait contenir au moins un élément."
     first = facts.asks[0]
     assert first.endswith("?"), first
@@ -30,27 +48,20 @@ def test_asks_include_full_question():
 
 def test_quotes_exclude_therapist_sentences():
     transcript = (
-        "Je me sens perdue depuis plusieurs semaines et je n'arrive plus à structurer mes journées, tout mon travail en pâtit et je m'inquiète de perdre mon poste. "
-        "Je passe mes nuits à ruminer et je me réveille très fatiguée, je ne sais pas comment tenir au travail sans soutien. "
-        "J'aimerais savoir si on peut adapter mon horaire de travail pour que je récupère un peu ? "
-        "Le thérapeute dit : je te propose de respirer profondément avant chaque réunion. "
-        "Je voudrais expliquer à mon employeur que ma charge de travail actuelle n'est pas soutenable et que je risque de craquer si rien ne change. "
-        "En dehors du foyer, mon frère me demande encore de l'argent et je suis perdue."
+        _WORK_DISTRESS
+        + "Le thérapeute dit : je te propose de respirer profondément avant chaque réunion. "
+        + _WORKLOAD
+        + " En dehors du foyer, mon frère me demande encore de l'argent et je suis perdue."
     )
-    facts = extract_session_facts(transcript, "Alice", "2024-02-01")
+    facts = _facts(transcript)
     assert len(facts.quotes) >= 3
     joined = " ".join(facts.quotes).lower()
     assert "je te propose" not in joined
 
 
 def test_context_sentence_is_clean():
-    transcript = (
-        "Je me sens perdue depuis plusieurs semaines et je n'arrive plus à structurer mes journées, tout mon travail en pâtit et je m'inquiète de perdre mon poste. "
-        "Je passe mes nuits à ruminer et je me réveille très fatiguée, je ne sais pas comment tenir au travail sans soutien. "
-        "J'aimerais savoir si on peut adapter mon horaire de travail pour que je récupère un peu ? "
-        "Je voudrais expliquer à mon employeur que ma charge de travail actuelle n'est pas soutenable et que je risque de craquer si rien ne change."
-    )
-    facts = extract_session_facts(transcript, "Alice", "2024-02-01")
+    transcript = _WORK_DISTRESS + _WORKLOAD
+    facts = _facts(transcript)
     travail_context = facts.context.get("travail")
     assert travail_context is not None
     assert travail_context.endswith(('.', '!', '?'))
@@ -0,0 +1,22 @@
+from server.utils.fr_text import normalize_punctuation, trim_quotes
+
+
+def test_trim_quotes_shortens_french_and_straight_quotes():
+    text = '« un deux trois quatre » puis "cinq six sept"'
+
+    assert trim_quotes(text, max_words=2) == "« un deux… » puis « cinq six… »"
+
+
+def test_trim_quotes_after_normalization():
+    citation = normalize_punctuation('"Le travail précaire épuise les corps et les liens"')
+
+    assert trim_quotes(citation, max_words=3) == "« Le travail précaire… »"
+
+
+def test_unbalanced_quotes_and_whitespace_runs_stay_linear():
+    # Ces entrées déclenchaient un retour arrière polynomial (plusieurs minutes).
+    blanks = " " * 20000
+
+    assert normalize_punctuation('"' + blanks + "x") == '" x'
+    assert trim_quotes("«" + blanks) == "«" + blanks
+    assert normalize_punctuation(blanks + "a — b") == "a (b)"
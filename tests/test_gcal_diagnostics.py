@@ -1,50 +1,43 @@
 import json
 import os
-import importlib
+import importlib.util
 import re
 import sys
 import types
+from functools import lru_cache
 from pathlib import Path
 
 from flask import Flask
 import pytest
 
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+_STUBS_INSTALLED = False
+
+
+def _is_available(name: str) -> bool:
+    """Tell whether ``name`` is importable without executing the package."""
+
+    return name in sys.modules or importlib.util.find_spec(name) is not None
+
+
 def _install_optional_stubs() -> None:
     """Install light stubs for optional dependencies required during import."""
 
-    root = Path(__file__).resolve().parents[1]
-
-    if "server" not in sys.modules:
-        server_pkg = types.ModuleType("server")
-        server_pkg.__path__ = [str(root / "server")]
-        sys.modules["server"] = server_pkg
-
-    if "server.services" not in sys.modules:
-        services_pkg = types.ModuleType("server.services")
-        services_pkg.__path__ = [str(root / "server" / "services")]
-        sys.modules["server.services"] = services_pkg
-    sys.modules["server"].services = sys.modules["server.services"]  # type: ignore[attr-defined]
-
-    if "server.blueprints" not in sys.modules:
-        blueprints_pkg = types.ModuleType("server.blueprints")
-        blueprints_pkg.__path__ = [str(root / "server" / "blueprints")]
-        sys.modules["server.blueprints"] = blueprints_pkg
-    sys.modules["server"].blueprints = sys.modules["server.blueprints"]  # type: ignore[attr-defined]
-
-    if "server.blueprints.library" not in sys.modules:
-        library_pkg = types.ModuleType("server.blueprints.library")
-        library_pkg.__path__ = [str(root / "server" / "blueprints" / "library")]
-        sys.modules["server.blueprints.library"] = library_pkg
-
-    if "modules" not in sys.modules:
-        modules_pkg = types.ModuleType("modules")
-        modules_pkg.__path__ = [str(root / "modules")]
-        sys.modules["modules"] = modules_pkg
-
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("docx")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
+    global _STUBS_INSTALLED
+    if _STUBS_INSTALLED:
+        return
+    _STUBS_INSTALLED = True
+
+    stubs: dict[str, types.ModuleType] = {}
+
+    for name in ("server", "server.services", "server.blueprints", "server.blueprints.library", "modules"):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [str(REPO_ROOT.joinpath(*name.split(".")))]
+            stubs[name] = package
+
+    if not _is_available("docx"):  # pragma: no cover - triggered only when package missing
         module = types.ModuleType("docx")
 
         class _Doc:
@@ -58,21 +51,15 @@ def _install_optional_stubs() -> None:
         enum_module = types.ModuleType("docx.enum")
         text_module = types.ModuleType("docx.enum.text")
         text_module.WD_PARAGRAPH_ALIGNMENT = types.SimpleNamespace(CENTER=1)  # type: ignore[attr-defined]
-        sys.modules["docx"] = module
-        sys.modules["docx.enum"] = enum_module
-        sys.modules["docx.enum.text"] = text_module
+        stubs.update({"docx": module, "docx.enum": enum_module, "docx.enum.text": text_module})
 
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("cairosvg")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
+    if not _is_available("cairosvg"):  # pragma: no cover - triggered only when package missing
         module = types.ModuleType("cairosvg")
         module.svg2pdf = lambda *_a, **_k: b""  # type: ignore[attr-defined]
-        sys.modules["cairosvg"] = module
+        stubs["cairosvg"] = module
 
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("reportlab")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
-        root = types.ModuleType("reportlab")
+    if not _is_available("reportlab"):  # pragma: no cover - triggered only when package missing
+        reportlab_pkg = types.ModuleType("reportlab")
         lib = types.ModuleType("reportlab.lib")
         pagesizes = types.ModuleType("reportlab.lib.pagesizes")
         pagesizes.A4 = (595, 842)  # type: ignore[attr-defined]
@@ -115,30 +102,30 @@ def _install_optional_stubs() -> None:
         pdfbase.pdfmetrics = pdfmetrics_module  # type: ignore[attr-defined]
         pdfbase.ttfonts = ttfonts_module  # type: ignore[attr-defined]
 
-        root.lib = lib  # type: ignore[attr-defined]
-        root.pdfbase = pdfbase  # type: ignore[attr-defined]
-        root.pdfgen = pdfgen_module  # type: ignore[attr-defined]
-
-        sys.modules["reportlab"] = root
-        sys.modules["reportlab.lib"] = lib
-        sys.modules["reportlab.lib.pagesizes"] = pagesizes
-        sys.modules["reportlab.pdfbase"] = pdfbase
-        sys.modules["reportlab.pdfbase.pdfmetrics"] = pdfmetrics_module
-        sys.modules["reportlab.pdfbase.ttfonts"] = ttfonts_module
-        sys.modules["reportlab.pdfgen"] = pdfgen_module
-        sys.modules["reportlab.pdfgen.canvas"] = canvas_module
-
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("yaml")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
+        reportlab_pkg.lib = lib  # type: ignore[attr-defined]
+        reportlab_pkg.pdfbase = pdfbase  # type: ignore[attr-defined]
+        reportlab_pkg.pdfgen = pdfgen_module  # type: ignore[attr-defined]
+
+        stubs.update(
+            {
+                "reportlab": reportlab_pkg,
+                "reportlab.lib": lib,
+                "reportlab.lib.pagesizes": pagesizes,
+                "reportlab.pdfbase": pdfbase,
+                "reportlab.pdfbase.pdfmetrics": pdfmetrics_module,
+                "reportlab.pdfbase.ttfonts": ttfonts_module,
+                "reportlab.pdfgen": pdfgen_module,
+                "reportlab.pdfgen.canvas": canvas_module,
+            }
+        )
+
+    if not _is_available("yaml"):  # pragma: no cover - triggered only when package missing
         module = types.ModuleType("yaml")
         module.safe_load = lambda *_a, **_k: {}  # type: ignore[attr-defined]
         module.safe_dump = lambda *_a, **_k: ""  # type: ignore[attr-defined]
-        sys.modules["yaml"] = module
+        stubs["yaml"] = module
 
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("pdfminer")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
+    if not _is_available("pdfminer"):  # pragma: no cover - triggered only when package missing
         root_pdfminer = types.ModuleType("pdfminer")
         pdfpage = types.ModuleType("pdfminer.pdfpage")
         pdfpage.PDFPage = type("PDFPage", (), {"get_pages": staticmethod(lambda *_a, **_k: [])})  # type: ignore[attr-defined]
@@ -163,21 +150,21 @@ def _install_optional_stubs() -> None:
             def get_text(self):
                 return ""
         layout_module.LTTextContainer = _LTTextContainer  # type: ignore[attr-defined]
-        sys.modules["pdfminer"] = root_pdfminer
-        sys.modules["pdfminer.pdfpage"] = pdfpage
-        sys.modules["pdfminer.pdfparser"] = pdfparser
-        sys.modules["pdfminer.pdfdocument"] = pdfdocument
-        sys.modules["pdfminer.high_level"] = high_level
-        sys.modules["pdfminer.layout"] = layout_module
-
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("regex")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
-        sys.modules["regex"] = re
-
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("langdetect")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
+        stubs.update(
+            {
+                "pdfminer": root_pdfminer,
+                "pdfminer.pdfpage": pdfpage,
+                "pdfminer.pdfparser": pdfparser,
+                "pdfminer.pdfdocument": pdfdocument,
+                "pdfminer.high_level": high_level,
+                "pdfminer.layout": layout_module,
+            }
+        )
+
+    if not _is_available("regex"):  # pragma: no cover - triggered only when package missing
+        stubs["regex"] = re
+
+    if not _is_available("langdetect"):  # pragma: no cover - triggered only when package missing
         langdetect_module = types.ModuleType("langdetect")
 
         class _DetectorFactory:  # pragma: no cover - import stub only
@@ -191,12 +178,9 @@ def _install_optional_stubs() -> None:
             pass
 
         langdetect_exc.LangDetectException = _LangDetectException  # type: ignore[attr-defined]
-        sys.modules["langdetect"] = langdetect_module
-        sys.modules["langdetect.lang_detect_exception"] = langdetect_exc
+        stubs.update({"langdetect": langdetect_module, "langdetect.lang_detect_exception": langdetect_exc})
 
-    try:  # pragma: no cover - optional dependency
-        importlib.import_module("sklearn")
-    except ModuleNotFoundError:  # pragma: no cover - triggered only when package missing
+    if not _is_available("sklearn"):  # pragma: no cover - triggered only when package missing
         sklearn_module = types.ModuleType("sklearn")
         feature_extraction = types.ModuleType("sklearn.feature_extraction")
         text_module = types.ModuleType("sklearn.feature_extraction.text")
@@ -214,9 +198,18 @@ def _install_optional_stubs() -> None:
         text_module.TfidfVectorizer = _TfidfVectorizer  # type: ignore[attr-defined]
         feature_extraction.text = text_module  # type: ignore[attr-defined]
         sklearn_module.feature_extraction = feature_extraction  # type: ignore[attr-defined]
-        sys.modules["sklearn"] = sklearn_module
-        sys.modules["sklearn.feature_extraction"] = feature_extraction
-        sys.modules["sklearn.feature_extraction.text"] = text_module
+        stubs.update(
+            {
+                "sklearn": sklearn_module,
+                "sklearn.feature_extraction": feature_extraction,
+                "sklearn.feature_extraction.text": text_module,
+            }
+        )
+
+    sys.modules.update({name: module for name, module in stubs.items() if name not in sys.modules})
+    server_pkg = sys.modules["server"]
+    server_pkg.services = sys.modules["server.services"]  # type: ignore[attr-defined]
+    server_pkg.blueprints = sys.modules["server.blueprints"]  # type: ignore[attr-defined]
 
 
 _install_optional_stubs()
@@ -245,170 +238,143 @@ def gcal_app(monkeypatch: pytest.MonkeyPatch, tmp_path):
     return app
 
 
-def _extract_status(response):
-    payload = response.get_json()
-    if isinstance(payload, dict) and payload.get("success") is True:
-        return payload.get("data", {})
-    return payload or {}
-
-
-def test_gcal_status_missing_secret(monkeypatch: pytest.MonkeyPatch, gcal_app):
-    monkeypatch.setenv("GOOGLE_CLIENT_ID", "client-id")
-    client = gcal_app.test_client()
-    status = _extract_status(client.get("/api/agenda/status"))
-    assert status["oauth_config_ok"] is False
-    assert status["reason"] == "missing_client_secret"
-    assert status["env_vars_present"]["GOOGLE_CLIENT_SECRET"] is False
+class _FakeCredentials:
+    valid = True
+    expired = False
+    refresh_token = None
 
+    def to_json(self) -> str:
+        return json.dumps({"token": "fake"})
 
-def test_gcal_status_redirect_mismatch(monkeypatch: pytest.MonkeyPatch, gcal_app):
-    config = {
-        "web": {
-            "client_id": "client",
-            "client_secret": "secret",
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-            "redirect_uris": ["https://example.com/callback"],
-        }
-    }
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_JSON", json.dumps(config))
-    client = gcal_app.test_client()
-    status = _extract_status(client.get("/api/agenda/status"))
-    assert status["configured"] is True
-    assert status["oauth_config_ok"] is False
-    assert status["reason"] == "redirect_uri_not_registered"
-    assert status["redirect_uri_ok"] is False
 
+class _FakeFlow:
+    """Fake ``Flow``: exchanging the code records the client secret in ``stored``."""
 
-def test_gcal_nominal_flow_sets_connected(monkeypatch: pytest.MonkeyPatch, gcal_app):
-    config = {
-        "web": {
-            "client_id": "client",
-            "client_secret": "secret",
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-            "redirect_uris": ["http://127.0.0.1:1421/agenda/gcal/oauth2callback"],
-        }
-    }
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_JSON", json.dumps(config))
+    def __init__(self, client_config, stored, fetch_token_side_effect=None):
+        self.client_config = client_config
+        self.redirect_uri = None
+        self.credentials = _FakeCredentials()
+        self._stored = stored
+        self._fetch_token_side_effect = fetch_token_side_effect
 
-    stored: dict[str, object] = {}
+    def authorization_url(self, **kwargs):
+        return "https://example.com/auth", kwargs.get("state", "state")
 
-    class _FakeCredentials:
-        valid = True
-        expired = False
-        refresh_token = None
+    def fetch_token(self, **_kwargs):
+        secret = self.client_config["web"]["client_secret"]
+        if self._fetch_token_side_effect is not None:
+            self._fetch_token_side_effect(secret)
+        self._stored["used_secret"] = secret
 
-        def to_json(self) -> str:
-            return json.dumps({"token": "fake"})
 
-    class _FakeFlow:
-        def __init__(self, *_args, **_kwargs):
-            self.redirect_uri = None
-            self.credentials = _FakeCredentials()
+@pytest.fixture(scope="function")
+def gcal_fake_oauth(request, monkeypatch: pytest.MonkeyPatch):
+    """Replace the Google OAuth flow and the token storage of ``GCalService``.
 
-        def authorization_url(self, **_kwargs):
-            return "https://example.com/auth", _kwargs.get("state", "state")
+    Optional indirect parameter: ``fetch_token_side_effect(secret)`` is called
+    when the code is exchanged and may raise (e.g. ``InvalidClientError``) to
+    simulate a rejected secret.  Returns the ``stored`` dict filled by the fakes.
+    """
 
-        def fetch_token(self, **_kwargs):
-            return None
+    fetch_token_side_effect = getattr(request, "param", None)
+    stored: dict[str, object] = {}
 
-    def _fake_store(self: GCalService, _credentials):
+    def _fake_store(self, _credentials):
         stored["creds"] = types.SimpleNamespace(valid=True)
+        resolved = self._last_resolved
+        stored["source"] = resolved.source if resolved else None
 
-    def _fake_load(self: GCalService):
+    def _fake_load(self):
         return stored.get("creds")
 
-    def _fake_delete(self: GCalService):
+    def _fake_delete(self):
         stored.pop("creds", None)
 
-    monkeypatch.setattr("server.services.gcal_service.Flow.from_client_config", lambda *_args, **_kwargs: _FakeFlow())
+    monkeypatch.setattr(
+        "server.services.gcal_service.Flow.from_client_config",
+        lambda config, *_args, **_kwargs: _FakeFlow(config, stored, fetch_token_side_effect),
+    )
     monkeypatch.setattr(GCalService, "_store_credentials", _fake_store, raising=False)
     monkeypatch.setattr(GCalService, "_load_credentials", _fake_load, raising=False)
     monkeypatch.setattr(GCalService, "_delete_credentials", _fake_delete, raising=False)
+    return stored
 
-    with gcal_app.app_context():
-        service = GCalService(gcal_app)
-        service.get_auth_url("state-token")
-        service.handle_oauth2_callback({"code": "auth-code"})
 
-    status = _extract_status(gcal_app.test_client().get("/api/agenda/status"))
-    assert status["connected"] is True
-    assert status["oauth_config_ok"] is True
-    assert status["client_type"] == "web"
+DEFAULT_REDIRECT = "http://127.0.0.1:1421/agenda/gcal/oauth2callback"
 
 
-def test_gcal_invalid_client_fallback(monkeypatch: pytest.MonkeyPatch, gcal_app, tmp_path):
-    primary_path = tmp_path / "primary.json"
-    fallback_path = tmp_path / "fallback.json"
-    primary_config = {
-        "web": {
-            "client_id": "client",
-            "client_secret": "bad-secret",
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-            "redirect_uris": ["http://127.0.0.1:1421/agenda/gcal/oauth2callback"],
-        }
-    }
-    fallback_config = {
-        "web": {
+def _gcfg(
+    kind: str = "web",
+    client_secret: str = "secret",
+    redirect_uris: tuple[str, ...] = (DEFAULT_REDIRECT,),
+) -> dict:
+    """Build an OAuth client config as downloaded from the Google console."""
+
+    return {
+        kind: {
             "client_id": "client",
-            "client_secret": "good-secret",
+            "client_secret": client_secret,
             "auth_uri": "https://accounts.google.com/o/oauth2/auth",
             "token_uri": "https://oauth2.googleapis.com/token",
-            "redirect_uris": ["http://127.0.0.1:1421/agenda/gcal/oauth2callback"],
+            "redirect_uris": list(redirect_uris),
         }
     }
-    primary_path.write_text(json.dumps(primary_config))
-    fallback_path.write_text(json.dumps(fallback_config))
-    monkeypatch.setenv(
-        "GOOGLE_CLIENT_SECRET_FILE",
-        os.pathsep.join([str(primary_path), str(fallback_path)]),
-    )
-
-    stored: dict[str, object] = {}
 
-    class _FakeCredentials:
-        valid = True
-        expired = False
-        refresh_token = None
 
-        def to_json(self) -> str:
-            return json.dumps({"token": "fake"})
+@lru_cache(maxsize=None)
+def _gcfg_json(*args, **kwargs) -> str:
+    return json.dumps(_gcfg(*args, **kwargs))
 
-    class _FakeFlow:
-        def __init__(self, client_config, *_args, **_kwargs):
-            self.client_config = client_config
-            self.redirect_uri = None
-            self.credentials = _FakeCredentials()
 
-        def authorization_url(self, **_kwargs):  # pragma: no cover - simple stub
-            return "https://example.com/auth", _kwargs.get("state", "state")
+def _extract_status(response):
+    payload = response.get_json()
+    if isinstance(payload, dict) and payload.get("success") is True:
+        return payload.get("data", {})
+    return payload or {}
 
-        def fetch_token(self, **_kwargs):
-            secret = self.client_config["web"]["client_secret"]
-            if secret == "bad-secret":
-                raise InvalidClientError()
-            stored["used_secret"] = secret
 
-    def _fake_from_client_config(config, **_kwargs):
-        return _FakeFlow(config)
+def test_gcal_status_missing_secret(monkeypatch: pytest.MonkeyPatch, gcal_app):
+    monkeypatch.setenv("GOOGLE_CLIENT_ID", "client-id")
+    client = gcal_app.test_client()
+    status = _extract_status(client.get("/api/agenda/status"))
+    assert status["oauth_config_ok"] is False
+    assert status["reason"] == "missing_client_secret"
+    assert status["env_vars_present"]["GOOGLE_CLIENT_SECRET"] is False
 
-    def _fake_store(self: GCalService, _credentials):
-        stored["creds"] = types.SimpleNamespace(valid=True)
-        resolved = self._last_resolved
-        stored["source"] = resolved.source if resolved else None
 
-    def _fake_load(self: GCalService):
-        return stored.get("creds")
+@pytest.mark.parametrize(
+    ("config_json", "expected"),
+    [
+        pytest.param(
+            _gcfg_json(redirect_uris=("https://example.com/callback",)),
+            {
+                "configured": True,
+                "reason": "redirect_uri_not_registered",
+                "redirect_uri_ok": False,
+            },
+            id="redirect_mismatch",
+        ),
+        pytest.param(
+            _gcfg_json("installed", redirect_uris=("http://localhost", DEFAULT_REDIRECT)),
+            {
+                "reason": "client_type_installed_not_supported_for_this_redirect",
+                "client_type": "installed",
+            },
+            id="installed_type",
+        ),
+    ],
+)
+def test_gcal_status_reports_config_mismatch(monkeypatch: pytest.MonkeyPatch, gcal_app, config_json, expected):
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_JSON", config_json)
+    client = gcal_app.test_client()
+    status = _extract_status(client.get("/api/agenda/status"))
+    assert status["oauth_config_ok"] is False
+    for key, value in expected.items():
+        assert status[key] == value
 
-    def _fake_delete(self: GCalService):
-        stored.pop("creds", None)
 
-    monkeypatch.setattr("server.services.gcal_service.Flow.from_client_config", _fake_from_client_config)
-    monkeypatch.setattr(GCalService, "_store_credentials", _fake_store, raising=False)
-    monkeypatch.setattr(GCalService, "_load_credentials", _fake_load, raising=False)
-    monkeypatch.setattr(GCalService, "_delete_credentials", _fake_delete, raising=False)
+def test_gcal_nominal_flow_sets_connected(monkeypatch: pytest.MonkeyPatch, gcal_app, gcal_fake_oauth):
+    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_JSON", _gcfg_json())
 
     with gcal_app.app_context():
         service = GCalService(gcal_app)
@@ -417,26 +383,32 @@ def test_gcal_invalid_client_fallback(monkeypatch: pytest.MonkeyPatch, gcal_app,
 
     status = _extract_status(gcal_app.test_client().get("/api/agenda/status"))
     assert status["connected"] is True
-    assert stored["used_secret"] == "good-secret"
-    assert stored["source"].endswith(fallback_path.name)
+    assert status["oauth_config_ok"] is True
+    assert status["client_type"] == "web"
 
 
-def test_gcal_installed_type_reports_mismatch(monkeypatch: pytest.MonkeyPatch, gcal_app):
-    config = {
-        "installed": {
-            "client_id": "client",
-            "client_secret": "secret",
-            "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-            "token_uri": "https://oauth2.googleapis.com/token",
-            "redirect_uris": [
-                "http://localhost",
-                "http://127.0.0.1:1421/agenda/gcal/oauth2callback",
-            ],
-        }
-    }
-    monkeypatch.setenv("GOOGLE_OAUTH_CLIENT_JSON", json.dumps(config))
-    client = gcal_app.test_client()
-    status = _extract_status(client.get("/api/agenda/status"))
-    assert status["oauth_config_ok"] is False
-    assert status["reason"] == "client_type_installed_not_supported_for_this_redirect"
-    assert status["client_type"] == "installed"
+def _reject_bad_secret(secret: str) -> None:
+    if secret == "bad-secret":
+        raise InvalidClientError()
+
+
+@pytest.mark.parametrize("gcal_fake_oauth", [_reject_bad_secret], indirect=True)
+def test_gcal_invalid_client_fallback(monkeypatch: pytest.MonkeyPatch, gcal_app, gcal_fake_oauth, tmp_path):
+    primary_path = tmp_path / "primary.json"
+    fallback_path = tmp_path / "fallback.json"
+    primary_path.write_text(_gcfg_json(client_secret="bad-secret"))
+    fallback_path.write_text(_gcfg_json(client_secret="good-secret"))
+    monkeypatch.setenv(
+        "GOOGLE_CLIENT_SECRET_FILE",
+        os.pathsep.join([str(primary_path), str(fallback_path)]),
+    )
+
+    with gcal_app.app_context():
+        service = GCalService(gcal_app)
+        service.get_auth_url("state-token")
+        service.handle_oauth2_callback({"code": "auth-code"})
+
+    status = _extract_status(gcal_app.test_client().get("/api/agenda/status"))
+    assert status["connected"] is True
+    assert gcal_fake_oauth["used_secret"] == "good-secret"
+    assert gcal_fake_oauth["source"].endswith(fallback_path.name)
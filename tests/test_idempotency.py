@@ -1,13 +1,13 @@
 import base64
 import io
+import json
 import math
-import struct
+import sys
 import wave
+from array import array
 
 import pytest
 
-from server import create_app
-
 
 def generate_wav_bytes(duration: float = 1.0, freq: float = 440.0) -> bytes:
     """Generate a mono sine wave of the given duration and frequency as WAV bytes."""
@@ -19,47 +19,68 @@ def generate_wav_bytes(duration: float = 1.0, freq: float = 440.0) -> bytes:
         wf.setsampwidth(2)
         wf.setframerate(framerate)
         num_frames = int(duration * framerate)
-        for i in range(num_frames):
-            t = i / float(framerate)
-            sample = int(amplitude * math.sin(2 * math.pi * freq * t))
-            wf.writeframesraw(struct.pack("<h", sample))
+        step = 2 * math.pi * freq / framerate
+        samples = array("h", (int(amplitude * math.sin(step * i)) for i in range(num_frames)))
+        if sys.byteorder == "big":  # pragma: no cover - WAV samples are little-endian
+            samples.byteswap()
+        wf.writeframes(samples.tobytes())
     return buffer.getvalue()
 
 
-def test_transcribe_idempotency(tmp_path):
-    """The same audio should yield the same session_id and be cached on repeat."""
-    app = create_app()
-    client = app.test_client()
+@pytest.fixture(scope="module")
+def wav_data_url() -> str:
+    """Two seconds of sine wave as a data URL, built once for the module."""
     wav_bytes = generate_wav_bytes(duration=2.0)
-    data_url = "data:audio/wav;base64," + base64.b64encode(wav_bytes).decode()
-    payload = {"audio": data_url, "options": {"chunk_seconds": 2, "overlap_seconds": 1}}
-    resp1 = client.post("/transcribe", json=payload)
-    assert resp1.status_code == 200
-    resp2 = client.post("/transcribe", json=payload)
-    assert resp2.status_code == 200
-    d1 = resp1.get_json()
-    d2 = resp2.get_json()
-    assert d1["session_id"] == d2["session_id"]
-    # Second response should indicate cached
-    assert d2.get("cached") is True
+    return "data:audio/wav;base64," + base64.b64encode(wav_bytes).decode()
 
 
-def test_post_session_idempotency(tmp_path):
-    """Calling /post_session twice with the same audio should reuse persisted artefacts."""
-    app = create_app()
-    client = app.test_client()
-    wav_bytes = generate_wav_bytes(duration=2.0)
-    data_url = "data:audio/wav;base64," + base64.b64encode(wav_bytes).decode()
+_CHUNK_OPTIONS = {"chunk_seconds": 2, "overlap_seconds": 1}
+
+
+@pytest.fixture(scope="module")
+def primed_transcribe(shared_app, wav_data_url):
+    """First /transcribe call, shared by the tests that expect a cache hit."""
+    payload = {"audio": wav_data_url, "options": _CHUNK_OPTIONS}
+    # Serialized once: both requests send these exact bytes.
+    body = json.dumps(payload).encode()
+    response = shared_app.test_client().post("/transcribe", data=body, content_type="application/json")
+    assert response.status_code == 200
+    return {"body": body, "data": response.get_json()}
+
+
+@pytest.fixture(scope="module")
+def primed_post_session(shared_app, wav_data_url):
+    """First /post_session call, shared by the tests that expect a cache hit."""
     payload = {
-        "audio": data_url,
-        "options": {"chunk_seconds": 2, "overlap_seconds": 1},
+        "audio": wav_data_url,
+        "options": _CHUNK_OPTIONS,
         "prenom": "Test",
     }
-    resp1 = client.post("/post_session", json=payload)
-    assert resp1.status_code == 200
-    d1 = resp1.get_json()
-    resp2 = client.post("/post_session", json=payload)
-    assert resp2.status_code == 200
-    d2 = resp2.get_json()
-    assert d1["meta"]["session_id"] == d2["meta"]["session_id"]
-    assert d2["meta"].get("cached") is True
\ No newline at end of file
+    # Serialized once: both requests send these exact bytes.
+    body = json.dumps(payload).encode()
+    response = shared_app.test_client().post("/post_session", data=body, content_type="application/json")
+    assert response.status_code == 200
+    return {"body": body, "data": response.get_json()}
+
+
+def test_transcribe_idempotency(client, primed_transcribe):
+    """The same audio should yield the same session_id and be cached on repeat."""
+    resp = client.post(
+        "/transcribe", data=primed_transcribe["body"], content_type="application/json"
+    )
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data["session_id"] == primed_transcribe["data"]["session_id"]
+    # Second response should indicate cached
+    assert data.get("cached") is True
+
+
+def test_post_session_idempotency(client, primed_post_session):
+    """Calling /post_session twice with the same audio should reuse persisted artefacts."""
+    resp = client.post(
+        "/post_session", data=primed_post_session["body"], content_type="application/json"
+    )
+    assert resp.status_code == 200
+    meta = resp.get_json()["meta"]
+    assert meta["session_id"] == primed_post_session["data"]["meta"]["session_id"]
+    assert meta.get("cached") is True
@@ -1,20 +1,8 @@
 import os
 import sys
 
-import pytest
-
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from server import create_app
-
-
-@pytest.fixture()
-def client():
-    app = create_app()
-    app.config.update({'TESTING': True})
-    with app.test_client() as client:
-        yield client
-
 
 def test_prompts_endpoint_returns_metadata(client):
     response = client.get('/api/journal-critique/prompts')
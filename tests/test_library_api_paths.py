@@ -10,7 +10,6 @@ pytest.importorskip("flask")
 
 sys.path.insert(0, os.path.abspath(Path(__file__).resolve().parents[1]))
 
-from server import create_app  # type: ignore  # noqa: E402
 from server.blueprints import library as library_bp  # type: ignore  # noqa: E402
 from server.utils.docid import doc_id_to_fs_path  # type: ignore  # noqa: E402
 
@@ -31,12 +30,18 @@ MINIMAL_PDF = (
 
 
 @pytest.fixture()
-def app(tmp_path, monkeypatch):
+def app(shared_app, tmp_path, monkeypatch):
+    """Application de session, isolée par test sur sa propre bibliothèque."""
+
     library_root = tmp_path / "library"
     monkeypatch.setenv("LIBRARY_ROOT", str(library_root))
     monkeypatch.setenv("FEATURE_LIBRARY_FS_V2", "1")
     monkeypatch.setenv("LIBRARY_FS_SHARDING", "1")
     monkeypatch.setenv("FLASK_ENV", "testing")
+    # L'instance est partagée : les chemins passent par sa config, restaurée
+    # par ``monkeypatch`` à la fin du test.
+    monkeypatch.setitem(shared_app.config, "LIBRARY_ROOT", str(library_root))
+    monkeypatch.setitem(shared_app.config, "LIBRARY_EXTRACTED_ROOT", str(library_root / "extracted"))
 
     class ImmediateExecutor:
         def submit(self, func, *args, **kwargs):
@@ -63,9 +68,7 @@ def app(tmp_path, monkeypatch):
 
     library_bp.TASK_STATE.clear()
 
-    app = create_app()
-    app.config.update(TESTING=True)
-    yield app
+    yield shared_app
 
 
 def test_upload_cycle_sets_status_done(app):
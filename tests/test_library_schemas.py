@@ -1,6 +1,7 @@
 """Tests de validation pour les schémas de la Bibliothèque."""
 from __future__ import annotations
 
+import json
 import os
 import sys
 from typing import Dict
@@ -11,7 +12,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 pytest.importorskip("pydantic")
 
-from schemas.library_schemas import SchemaValidationError, validate_plan_payload
+from schemas.library_schemas import (
+    SchemaValidationError,
+    validate_plan_payload,
+    validate_plan_payload_json,
+)
 
 
 def _build_payload() -> Dict[str, object]:
@@ -55,3 +60,10 @@ def test_validate_plan_payload_rejects_missing_candidate_id() -> None:
     with pytest.raises(SchemaValidationError):
         validate_plan_payload(payload)
 
+
+def test_validate_plan_payload_json_matches_dict_path() -> None:
+    payload = _build_payload()
+    raw = json.dumps(payload).encode("utf-8")
+    assert validate_plan_payload_json(raw) == validate_plan_payload(payload)
+    with pytest.raises(SchemaValidationError):
+        validate_plan_payload_json(b"{\"proposed_notions\": []}")
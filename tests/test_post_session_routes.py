@@ -101,6 +101,43 @@ def test_process_unsupported_format(client):
     assert payload['error'] == 'unsupported_audio_format'
 
 
+def test_process_rejects_oversized_request(client, monkeypatch):
+    from server.tabs.post_session import routes as post_session_routes
+
+    monkeypatch.setattr(post_session_routes, '_MAX_AUDIO_REQUEST_BYTES', 64)
+    data = {'audio': (io.BytesIO(b'RIFF' + b'0' * 256), 'session.wav')}
+    response = client.post('/api/post/process', data=data, content_type='multipart/form-data')
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'audio_too_large'
+
+
+def test_spooled_upload_stops_past_audio_limit(monkeypatch, tmp_path):
+    from werkzeug.datastructures import FileStorage
+
+    monkeypatch.setenv('POST_SESSION_SPOOL_DIR', str(tmp_path))
+    monkeypatch.setattr(logic, '_MAX_AUDIO_BYTES', 16)
+    upload = FileStorage(io.BytesIO(b'RIFF' + b'0' * 64), filename='session.wav')
+    with pytest.raises(ValueError, match='audio_too_large'):
+        with logic.spooled_upload(upload):
+            pass
+    assert not list(tmp_path.iterdir())
+
+
+def test_plan_rejects_oversized_chunked_body(client, monkeypatch):
+    from server.tabs.post_session import routes as post_session_routes
+
+    monkeypatch.setattr(post_session_routes, '_MAX_JSON_PAYLOAD_BYTES', 64)
+    body = b'{"transcript": "' + b'x' * 256 + b'"}'
+    response = client.post(
+        '/api/post/plan',
+        input_stream=io.BytesIO(body),
+        headers={'Transfer-Encoding': 'chunked', 'Content-Type': 'application/json'},
+        environ_overrides={'wsgi.input_terminated': True},
+    )
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'payload_too_large'
+
+
 def test_validate_reperes_section_guardrails():
     sections = [
         {'title': 'Titre 1', 'body': 'mot ' * 130},
@@ -113,6 +150,23 @@ def test_validate_reperes_section_guardrails():
         logic.validate_reperes_section(sections)
 
 
+def test_cached_plan_artifacts_are_not_shared():
+    from server.tabs.post_session import routes as post_session_routes
+
+    transcript = "Séance consacrée au sommeil et à la gestion du stress au travail."
+    first = post_session_routes._compute_plan_cached(transcript, None, None, None)
+    first.plan['injected'] = True
+    first.chapters.append({'title': 'muté'})
+    second = post_session_routes._compute_plan_cached(transcript, None, None, None)
+    assert 'injected' not in second.plan
+    assert {'title': 'muté'} not in second.chapters
+
+    token = logic.pack_plan_artifacts(second)
+    unpacked = post_session_routes._unpack_plan_cached(token)
+    unpacked.plan['injected'] = True
+    assert 'injected' not in post_session_routes._unpack_plan_cached(token).plan
+
+
 def test_transcribe_endpoint(client):
     audio_content = b"Premiere consultation de suivi sur la gestion du stress."
     response = client.post(
@@ -131,6 +185,22 @@ def test_transcribe_endpoint(client):
     assert isinstance(data['transcript_url'], str)
 
 
+def test_transcript_download_revalidates(client):
+    response = client.post(
+        '/api/post/transcribe',
+        data={'audio': (io.BytesIO(b"Suivi de la gestion du stress au travail."), 'session.txt')},
+        content_type='multipart/form-data',
+    )
+    url = response.get_json()['data']['transcript_url']
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    etag = first.headers['ETag']
+    second = client.get(url, headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['Cache-Control'] == 'private, no-cache'
+
+
 def test_transcribe_accepts_binary_body(client):
     audio_content = (
         "Séance Opera envoyée en flux binaire pour valider le fallback serveur."
@@ -6,7 +6,7 @@ from pathlib import Path
 import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'server'))  # noqa: E402
-from transcriber import Transcriber
+from transcriber import Transcriber, _fix_wav_sizes, _wav_duration
 
 
 @pytest.fixture(scope='module')
@@ -47,4 +47,28 @@ def test_chunking_and_transcription(sine_wave):
     # The concatenated text should include placeholder transcripts
     assert '[audio' in data['text']
     # Duration should be reported
-    assert data['duration'] >= 19
\ No newline at end of file
+    assert data['duration'] >= 19
+
+
+def test_fix_wav_sizes_patches_streamed_header(sine_wave):
+    """ffmpeg leaves placeholder sizes when writing WAV to a pipe."""
+    import io
+    import struct
+    import wave
+    data = bytearray(sine_wave.read_bytes())
+    struct.pack_into('<I', data, 4, 0xFFFFFFFF)
+    data_offset = data.index(b'data')
+    struct.pack_into('<I', data, data_offset + 4, 0xFFFFFFFF)
+    fixed = _fix_wav_sizes(bytes(data))
+    with wave.open(io.BytesIO(fixed), 'rb') as wf:
+        assert wf.getnframes() == 20 * 16000
+    assert fixed == sine_wave.read_bytes()
+
+
+def test_wav_duration_reads_header(sine_wave):
+    assert _wav_duration(sine_wave.read_bytes()) == pytest.approx(20.0)
+
+
+def test_wav_duration_truncated_header_returns_zero(sine_wave):
+    """A header cut inside the ``fmt `` chunk must not raise."""
+    assert _wav_duration(sine_wave.read_bytes()[:30]) == 0.0